@@ -2,142 +2,65 @@
 # 🌈 감정 기록 & 분석 앱
 # - 감정 기록/메모
 # - 주간 감정 분석(그래프/캘린더)
+# - 장기 추세(이동 평균/월별 분포/연속 기록)
 # - 맞춤 피드백
 # - 챌린지 기능
-# - PDF 리포트 및 CSV 내보내기
+# - PDF 리포트 및 CSV 내보내기/가져오기
 
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
-import io
-import os
-from fpdf import FPDF
+from concurrent.futures import TimeoutError,wait
+import tempfile
+from emotion_core import EMOTIONS,EMO_LABELS,FEEDBACK,get_week_range,weekly_counts,emotion_calendar
+from emotion_journal import Journal
+from emotion_charts import create_week_plot,create_calendar_plot
+from emotion_report import ReportService,report_version
+from perf import begin_rerun,end_rerun,panel_enabled,render_panel
 
 # ----------------------
 # 설정
 # ----------------------
-DATA_FILE = "emotions.csv"
-EMOTIONS = ["very_happy","happy","neutral","tired","sad","angry","anxious","stressed"]
-EMO_LABELS = {
-    "very_happy":"😊 매우 좋음","happy":"🙂 좋음","neutral":"😐 보통",
-    "tired":"😴 피곤","sad":"😢 우울","angry":"😠 화남","anxious":"😬 불안","stressed":"😣 스트레스"
-}
-FEEDBACK = {
-    "very_happy":("좋아요! 오늘 좋은 일을 축하해요.","친구에게 감사 인사 보내기나 기분을 기록해보세요."),
-    "happy":("기분이 좋군요!","짧은 산책이나 좋아하는 음악을 들으며 즐거운 시간을 보내보세요."),
-    "neutral":("보통인 하루네요.","가벼운 스트레칭이나 5분 명상으로 기분을 끌어올려보세요."),
-    "tired":("피곤하군요.","짧은 낮잠(15~20분)이나 휴식 시간을 추천합니다."),
-    "sad":("힘든 날이군요.","가까운 사람에게 이야기해보거나, 따뜻한 차 한 잔을 추천합니다."),
-    "angry":("화가 난 상태네요.","심호흡 4-4-4(들4-참4-내4) 1분 수행 권장."),
-    "anxious":("불안하네요.","짧은 산책이나 5분 호흡 명상이 도움이 됩니다."),
-    "stressed":("스트레스가 많아 보입니다.","해야 할 일을 작은 단위로 쪼개서 하나씩 처리해보세요.")
-}
+DATA_DIR = "data"  # 사용자별 기록 파일 + users.json
+LEGACY_FILE = "emotions.csv"  # 예전 단일 기록 파일 (있으면 처음 실행 때 기본 사용자에게 옮김)
+DEFAULT_USER = "학생"
 
 # ----------------------
 # 유틸 함수
 # ----------------------
-def load_data():
-    if os.path.exists(DATA_FILE):
-        return pd.read_csv(DATA_FILE, parse_dates=["timestamp"])
-    else:
-        return pd.DataFrame(columns=["timestamp","date","time","emotion","note"])
-
-def save_data(df):
-    df.to_csv(DATA_FILE,index=False)
-
-def add_entry(emotion,note,when=None):
-    df = load_data()
-    now = when if when else datetime.now()
-    entry = {"timestamp":now,"date":now.date().isoformat(),"time":now.time().strftime("%H:%M:%S"),"emotion":emotion,"note":note}
-    df = pd.concat([df,pd.DataFrame([entry])],ignore_index=True)
-    save_data(df)
-    return df
-
-def get_week_range(ref_date=None):
-    ref = ref_date if ref_date else datetime.now().date()
-    start = ref - timedelta(days=ref.weekday())
-    end = start + timedelta(days=6)
-    return start,end
-
-def weekly_counts(df,ref_date=None):
-    start,end = get_week_range(ref_date)
-    mask = (pd.to_datetime(df["date"]).dt.date >= start) & (pd.to_datetime(df["date"]).dt.date <= end)
-    week = df.loc[mask].copy()
-    counts = week["emotion"].value_counts().reindex(EMOTIONS,fill_value=0)
-    return counts,week
-
-def emotion_calendar(df,ref_date=None):
-    start,end = get_week_range(ref_date)
-    dates = [start+timedelta(days=i) for i in range(7)]
-    day_emotion = {}
-    for d in dates:
-        mask = pd.to_datetime(df["date"]).dt.date==d
-        day = df.loc[mask]
-        day_emotion[d] = day.sort_values("timestamp").iloc[-1]["emotion"] if len(day)>0 else None
-    return day_emotion
-
-def create_week_plot(counts):
-    fig,ax = plt.subplots()
-    idx = [EMO_LABELS[e] for e in counts.index]
-    ax.bar(idx,counts.values)
-    ax.set_title("이번 주 감정 분포")
-    ax.set_ylabel("기록 수")
-    plt.xticks(rotation=45,ha="right")
-    plt.tight_layout()
-    buf = io.BytesIO()
-    fig.savefig(buf,format="png")
-    buf.seek(0)
-    return buf
-
-def create_calendar_plot(day_emotion):
-    score_map = {"very_happy":4,"happy":3,"neutral":2,"tired":1,"sad":0,"angry":0,"anxious":0,"stressed":0}
-    dates = list(day_emotion.keys())
-    scores = [score_map[e] if e else np.nan for e in day_emotion.values()]
-    fig,ax = plt.subplots()
-    ax.plot(dates,scores,marker="o")
-    ax.set_ylim(-0.5,4.5)
-    ax.set_yticks([0,1,2,3,4])
-    ax.set_yticklabels(["neg","tired","neutral","happy","very\nhappy"])
-    ax.set_title("주간 감정 캘린더")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    buf = io.BytesIO()
-    fig.savefig(buf,format="png")
-    buf.seek(0)
-    return buf
-
-def generate_pdf_report(summary_text,week_buf,calendar_buf,filename="weekly_report.pdf"):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial","B",16)
-    pdf.cell(0,10,"주간 감정 리포트",ln=True,align="C")
-    pdf.ln(4)
-    pdf.set_font("Arial",size=12)
-    for line in summary_text.split("\n"):
-        pdf.multi_cell(0,6,line)
-    pdf.ln(4)
-    pdf.set_font("Arial","B",12)
-    pdf.cell(0,6,"이번 주 감정 분포",ln=True)
-    pdf.image(week_buf,x=15,w=180)
-    pdf.ln(4)
-    pdf.cell(0,6,"주간 감정 캘린더",ln=True)
-    pdf.image(calendar_buf,x=15,w=180)
-    out = io.BytesIO()
-    pdf.output(out)
-    out.seek(0)
-    return out
+@st.cache_resource
+def get_journal():
+    # 서버 프로세스당 하나 (사용자별 저장소, 묶음 저장 큐, 집계/인덱스 캐시)
+    return Journal(DATA_DIR,legacy_file=LEGACY_FILE,legacy_user=DEFAULT_USER)
+
+@st.cache_resource
+def get_reports():
+    # 서버 전체가 공유하는 PDF 생성 작업 풀 + 결과 캐시
+    return ReportService()
+
+def load_data(name):
+    return get_journal().load_data(name)
+
+def save_data(name,df):
+    get_journal().save_data(name,df)
+
+def add_entry(name,emotion,note,when=None):
+    # 저장이 제한 시간 안에 끝나지 않으면 None (기록은 나중에 저장될 수 있다)
+    try:
+        return get_journal().add_entry(name,emotion,note,when)
+    except TimeoutError:
+        st.error("저장이 지연되고 있습니다. 잠시 후 기록 내역을 확인해주세요.")
+        return None
 
 # ----------------------
 # Streamlit UI
 # ----------------------
+begin_rerun("emotion")
 st.set_page_config(page_title="감정 기록 & 분석",layout="wide")
 st.title("🌈 감정 기록 & 분석 앱")
 
 with st.sidebar:
     st.header("설정")
-    name = st.text_input("이름 (선택)","학생")
+    name = st.text_input("이름 (선택)",DEFAULT_USER)
     selected_date = st.date_input("기록 날짜 선택",datetime.now().date())
     st.markdown("---")
     st.subheader("주간 챌린지")
@@ -153,9 +76,9 @@ with col1:
     note = st.text_area("메모 (선택)","",max_chars=300,height=80)
     if st.button("기록 저장"):
         now = datetime.combine(selected_date,datetime.now().time())
-        df = add_entry(emotion,note,when=now)
-        st.success("기록이 저장되었습니다! 📥")
-        st.experimental_rerun()
+        if add_entry(name,emotion,note,when=now) is not None:
+            st.success("기록이 저장되었습니다! 📥")
+            st.rerun()
 with col2:
     title,suggestion = FEEDBACK.get(emotion,("감정 인식","작은 활동을 시도해보세요"))
     st.info(title)
@@ -165,15 +88,32 @@ with col2:
 
 # 기록 내역
 st.subheader("기록 내역")
-df = load_data()
-if df.empty:
+history = get_journal().history(name)
+has_data = len(history)>0
+if not has_data:
     st.info("아직 기록이 없습니다.")
 else:
-    st.dataframe(df.sort_values("timestamp",ascending=False))
+    # 최신순으로 한 페이지만 꺼내서 보낸다
+    hcol1,hcol2,hcol3 = st.columns([3,1,1])
+    with hcol1:
+        range_start,range_end = None,None
+        if st.checkbox("기간으로 보기"):
+            period = st.date_input("기간",(selected_date-timedelta(days=30),selected_date))
+            if len(period)==2:
+                range_start,range_end = period
+    with hcol2:
+        page_size = st.selectbox("페이지당",[20,50,100],index=1)
+    total = history.count(range_start,range_end)
+    pages = max((total+page_size-1)//page_size,1)
+    with hcol3:
+        page_no = st.number_input("페이지",min_value=1,max_value=pages,value=1)
+    page_df,_ = history.page(page_no-1,page_size,range_start,range_end)
+    st.dataframe(page_df)
+    st.caption(f"기간 내 {total}건 · {page_no}/{pages} 페이지")
 
 # 주간 분석
 st.subheader("주간 분석")
-week_counts,week_df = weekly_counts(df,ref_date=selected_date)
+week_counts = weekly_counts(get_journal().rollup(name),ref_date=selected_date)
 col3,col4 = st.columns(2)
 with col3:
     st.markdown("**이번 주 감정 분포 (막대그래프)**")
@@ -182,7 +122,7 @@ with col3:
     st.write(week_counts.rename(index=EMO_LABELS))
 with col4:
     st.markdown("**주간 감정 캘린더**")
-    day_em = emotion_calendar(df,ref_date=selected_date)
+    day_em = emotion_calendar(get_journal().rollup(name),ref_date=selected_date)
     cal_buf = create_calendar_plot(day_em)
     st.image(cal_buf)
     cols = st.columns(7)
@@ -191,9 +131,32 @@ with col4:
             st.write(d.strftime("%a %m/%d"))
             st.write(EMO_LABELS[emo] if emo else "-")
 
+# 장기 추세
+st.subheader("장기 추세")
+if has_data:
+    trends = get_journal().trends(name)
+    span = st.radio("기간",("최근 90일","최근 1년","전체"),horizontal=True)
+    days = {"최근 90일":90,"최근 1년":365}.get(span)
+    trend_start = selected_date-timedelta(days=days-1) if days else None
+    col5,col6 = st.columns(2)
+    with col5:
+        st.markdown("**기분 점수 이동 평균 (7일/30일)**")
+        st.line_chart(trends.rolling((7,30),trend_start,selected_date))
+    with col6:
+        st.markdown("**월별 감정 분포**")
+        st.bar_chart(trends.monthly(trend_start,selected_date).rename(columns=EMO_LABELS))
+    streak = trends.streaks(trend_start,selected_date)
+    m1,m2,m3,m4 = st.columns(4)
+    m1.metric("연속 기록 (현재)",f"{streak['record_current']}일")
+    m2.metric("연속 기록 (최장)",f"{streak['record_longest']}일")
+    m3.metric("연속 긍정 (현재)",f"{streak['positive_current']}일")
+    m4.metric("연속 긍정 (최장)",f"{streak['positive_longest']}일")
+else:
+    st.info("기록이 쌓이면 장기 추세를 볼 수 있습니다.")
+
 # 챌린지
 st.subheader("챌린지 진행 상황")
-positive_count = week_df[week_df["emotion"].isin(["very_happy","happy"])].shape[0]
+positive_count = int(week_counts[["very_happy","happy"]].sum())
 st.write(f"이번 주 긍정 기록 수: **{positive_count}** / 목표 **{weekly_goal}**")
 if positive_count >= weekly_goal and not st.session_state.get("challenge_awarded",False):
     st.balloons()
@@ -204,27 +167,50 @@ elif st.session_state.get("challenge_awarded",False):
 
 # PDF 다운로드
 st.subheader("주간 리포트 다운로드 (PDF)")
-if not df.empty:
-    avg_emotion = week_counts.idxmax() if week_counts.sum()>0 else None
-    summary_lines = [f"사용자: {name}",
-                     f"주간 ({get_week_range(selected_date)[0]} ~ {get_week_range(selected_date)[1]}) 요약:",
-                     f"- 총 기록 수: {len(week_df)}",
-                     f"- 가장 많이 기록된 감정: {EMO_LABELS[avg_emotion] if avg_emotion else '기록 없음'}","",
-                     "추천 활동:"]
-    if avg_emotion:
-        summary_lines.append(f"- {FEEDBACK[avg_emotion][0]}: {FEEDBACK[avg_emotion][1]}")
-    summary_text = "\n".join(summary_lines)
-    week_plot_buf = create_week_plot(week_counts)
-    calendar_buf = create_calendar_plot(day_em)
-    pdf_bytes = generate_pdf_report(summary_text,week_plot_buf,calendar_buf)
-    st.download_button("PDF 리포트 다운로드",data=pdf_bytes,file_name="weekly_emotion_report.pdf",mime="application/pdf")
+if has_data:
+    week_start,week_end = get_week_range(selected_date)
+    reports = get_reports()
+    # 버튼을 누른 경우에만 생성하고, 그 주에 새 기록이 없으면 만들어 둔 결과를 재사용
+    report = reports.get(name,week_start,report_version(week_counts,day_em))
+    if report is None and st.button("PDF 리포트 만들기"):
+        report = reports.submit(name,week_start,week_end,week_counts,day_em)
+    if report is not None:
+        if not report.done():
+            with st.spinner("PDF 리포트를 만드는 중입니다..."):
+                wait([report],timeout=60)
+        if not report.done():
+            st.info("리포트를 아직 만드는 중입니다. 잠시 후 다시 시도해주세요.")
+        elif report.exception() is not None:
+            st.error("리포트 생성에 실패했습니다. 다시 시도해주세요.")
+        else:
+            st.download_button("PDF 리포트 다운로드",data=report.result(),file_name="weekly_emotion_report.pdf",mime="application/pdf")
 
 # CSV 다운로드
 st.subheader("데이터 내보내기")
-if not df.empty:
-    csv = df.to_csv(index=False).encode("utf-8")
-    st.download_button("CSV 다운로드",data=csv,file_name="emotions.csv",mime="text/csv")
+if has_data and st.button("CSV 파일 만들기"):
+    # 눌렀을 때만 저장소에서 청크 단위로 임시 파일에 흘려 쓴다 (전체 기록을 DataFrame 으로 만들지 않음).
+    # st.download_button 은 내려줄 내용을 통째로 메모리에 들고 있어야 해서 완성된 바이트 한 벌은 올라간다.
+    with tempfile.TemporaryFile() as csv_file:
+        get_journal().export_csv(name,csv_file)
+        csv_file.seek(0)
+        csv_bytes = csv_file.read()
+    st.download_button("CSV 다운로드",data=csv_bytes,file_name="emotions.csv",mime="text/csv")
+
+# CSV 가져오기
+with st.expander("CSV 가져오기 (대량)"):
+    uploaded = st.file_uploader("timestamp(또는 date,time), emotion, note 열이 있는 CSV",type="csv")
+    if uploaded is not None and st.button("가져오기"):
+        try:
+            imported,rejected = get_journal().import_csv(name,uploaded)
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            st.success(f"{imported}건을 가져왔습니다. (형식이 맞지 않아 건너뛴 행: {rejected}건)")
 
 st.markdown("---")
 st.caption("제작: Streamlit 기반 감정 기록 & 분석 앱 — 수행평가용 예시")
 
+# 성능 계측 (PERF_LOG 로 JSONL 기록, ?debug=1 이면 사이드바 패널)
+perf_summary = end_rerun()
+if panel_enabled():
+    render_panel(perf_summary)
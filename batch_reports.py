@@ -0,0 +1,76 @@
+# batch_reports.py
+# 🗂️ 주간 리포트 일괄 생성 (화면 없이 실행)
+# - users.json 의 모든 사용자에 대해 지정한 주의 PDF 리포트를 만든다
+# - 프로세스 풀로 나눠서 만들고(작업 프로세스마다 matplotlib 상태가 따로) 끝나는 대로 파일로 쓴다
+# 사용법: python batch_reports.py --week 2025-03-10 --data data --out reports --workers 8
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+
+from emotion_core import DailyRollup,get_week_range,weekly_counts,emotion_calendar
+from emotion_report import render_weekly_report
+from emotion_storage import PartitionedStorage
+
+def _init_worker():
+    # 작업 프로세스마다 화면 없는 백엔드로 시작한다
+    import matplotlib
+    matplotlib.use("Agg")
+
+def build_report(data_dir,ext,key,name,ref_date,out_dir):
+    # (경로, 크기, None) 또는 (None, 0, 오류 문자열).
+    # 예외를 그대로 넘기면 pickle 로 되돌릴 수 없는 예외(fpdf 등) 하나가 풀 전체를 깨뜨려
+    # 다른 사용자 작업까지 모두 실패하므로 작업 안에서 잡아 문자열로 돌려준다.
+    try:
+        store = PartitionedStorage(data_dir,ext=ext)
+        rollup = DailyRollup.from_frame(store.for_user(name).load_compact())
+        start,end = get_week_range(ref_date)
+        counts = weekly_counts(rollup,ref_date)
+        day_em = emotion_calendar(rollup,ref_date)
+        pdf = render_weekly_report(name,start,end,counts,day_em)
+        path = os.path.join(out_dir,f"{key}_{start}.pdf")
+        with open(path,"wb") as f:
+            f.write(pdf)
+        return path,len(pdf),None
+    except Exception as e:
+        return None,0,repr(e)
+
+def run(data_dir,ref_date,out_dir,workers=None,ext=".csv"):
+    users = PartitionedStorage(data_dir,ext=ext).users()
+    os.makedirs(out_dir,exist_ok=True)
+    started = time.perf_counter()
+    done = failed = 0
+    with ProcessPoolExecutor(max_workers=workers,initializer=_init_worker) as pool:
+        jobs = {pool.submit(build_report,data_dir,ext,key,name,ref_date,out_dir):name for key,name in users.items()}
+        for job in as_completed(jobs):
+            try:
+                path,size,error = job.result()
+            except Exception as e:  # 작업 프로세스가 죽은 경우 등
+                path,size,error = None,0,repr(e)
+            if error:
+                failed += 1
+                print(f"실패: {jobs[job]} ({error})")
+            else:
+                done += 1
+                print(f"{path} ({size:,} bytes)")
+    elapsed = time.perf_counter()-started
+    rate = done/elapsed if elapsed>0 else 0.0
+    print(f"완료 {done}건, 실패 {failed}건, {elapsed:.2f}초 ({rate:.1f}건/초)")
+    return done,failed,elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="모든 사용자의 주간 감정 리포트(PDF)를 한 번에 만든다")
+    parser.add_argument("--week",default=date.today().isoformat(),help="주에 포함된 아무 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--data",default="data",help="사용자별 기록 폴더 (app.py 의 DATA_DIR)")
+    parser.add_argument("--out",default="reports",help="PDF 를 쓸 폴더")
+    parser.add_argument("--workers",type=int,default=None,help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--ext",default=".csv",help="사용자 파일 확장자")
+    args = parser.parse_args()
+    ref_date = datetime.strptime(args.week,"%Y-%m-%d").date()
+    _,failed,_ = run(args.data,ref_date,args.out,args.workers,args.ext)
+    raise SystemExit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
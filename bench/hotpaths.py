@@ -0,0 +1,148 @@
+# bench/hotpaths.py
+# 🏎️ 핫패스 벤치마크
+# - 감정 기록: 저장/불러오기, 일별 집계·내역 인덱스 생성, add_entry, weekly_counts, emotion_calendar
+# - 차트(처음 렌더 / 캐시) 와 PDF 리포트
+# - 직업 카탈로그: 생성, match_job, rank_jobs
+# - 별자리: get_zodiac, 배열 API, 명단 일괄 운세
+# 데이터는 bench/synthetic.py 로 임시 폴더에 만든다.
+# 사용법 (저장소 루트에서):
+#   python bench/hotpaths.py                      # 기본 크기
+#   python bench/hotpaths.py --rows 10000000      # 1천만 행
+#   python bench/hotpaths.py --save               # bench/results/hotpaths.jsonl 에 기록
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+import record  # 저장소 루트를 sys.path 에 넣는다
+import synthetic
+
+from career_catalog import get_catalog, match_job, rank_jobs
+from emotion_charts import clear_chart_cache, create_calendar_plot, create_week_plot
+from emotion_core import get_week_range, weekly_counts, emotion_calendar
+from emotion_journal import Journal
+from perf import percentile
+from zodiac_batch import generate
+from zodiac_core import get_zodiac, zodiac_of_dates
+
+def _once(fn):
+    t = time.perf_counter()
+    fn()
+    return {"cold_ms": (time.perf_counter() - t) * 1000}
+
+def _timeit(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t) * 1000)
+    return {"n": repeat, "p50_ms": percentile(samples, 50), "p95_ms": percentile(samples, 95)}
+
+# --- 감정 기록 ---
+def bench_emotion(rows, data_dir, ext, repeat):
+    journal = Journal(data_dir, ext=ext)
+    name = f"bench{rows}"
+    df = synthetic.emotion_history(rows)
+    t = time.perf_counter()
+    journal.save_data(name, df)
+    result = {"save": {"cold_ms": (time.perf_counter() - t) * 1000}}
+    del df  # 큰 프레임은 저장 후 바로 놓아준다 (이후 RSS 측정에 섞이지 않게)
+    result["load_data"] = _once(lambda: journal.load_data(name))
+    result["rollup_build"] = _once(lambda: journal.rollup(name))
+    result["history_build"] = _once(lambda: journal.history(name))
+    rollup = journal.rollup(name)
+    today = date.today()
+    result["weekly_counts"] = _timeit(lambda: weekly_counts(rollup, today), repeat)
+    result["emotion_calendar"] = _timeit(lambda: emotion_calendar(rollup, today), repeat)
+    result["add_entry"] = _timeit(lambda: journal.add_entry(name, "happy", "bench"), repeat)
+    result["history_page"] = _timeit(lambda: journal.history(name).page(0, 50), repeat)
+    result["rss_mb"] = record.rss_mb()
+    return result, journal, name
+
+def bench_reports(journal, name, repeat):
+    from emotion_report import render_weekly_report
+    rollup = journal.rollup(name)
+    start, end = get_week_range()
+    counts, day_emotion = weekly_counts(rollup), emotion_calendar(rollup)
+    clear_chart_cache()
+    result = {
+        "week_plot": {**_once(lambda: create_week_plot(counts)), **_timeit(lambda: create_week_plot(counts), repeat)},
+        "calendar_plot": {**_once(lambda: create_calendar_plot(day_emotion)),
+                          **_timeit(lambda: create_calendar_plot(day_emotion), repeat)},
+    }
+    try:
+        result["pdf"] = _timeit(lambda: render_weekly_report(name, start, end, counts, day_emotion), max(repeat // 10, 1))
+    except Exception as e:  # fpdf 미설치 / 한글 글꼴 문제 등은 기록만 남긴다
+        result["pdf"] = {"error": f"{type(e).__name__}: {e}"}
+    return result
+
+# --- 직업 카탈로그 ---
+def bench_catalog(size, tmp, repeat):
+    path = synthetic.write_catalog(synthetic.job_catalog(size), os.path.join(tmp, f"jobs_{size}.json"))
+    result = {"load": _once(lambda: get_catalog(path))}
+    catalog = get_catalog(path)
+    mbti = catalog.index.mbti_list[0]
+    keyword = catalog.jobs[0].title.split()[0]
+    skills = list(catalog.index.skill_options[:1])
+    result["match_mbti"] = _timeit(lambda: match_job(mbti, path=path), repeat)
+    result["match_keyword"] = _timeit(lambda: match_job(mbti, keyword, path=path), repeat)
+    result["match_skills"] = _timeit(lambda: match_job(mbti, keyword, skills, path=path), repeat)
+    result["rank_top10"] = _timeit(lambda: rank_jobs(mbti, keyword, skills, 10, path=path), repeat)
+    result["rss_mb"] = record.rss_mb()
+    return result
+
+# --- 별자리 ---
+def bench_zodiac(size):
+    rows = synthetic.roster(size)
+    births = [date.fromisoformat(r["birth"]) for r in rows]
+    t = time.perf_counter()
+    for b in births:
+        get_zodiac(b.month, b.day)
+    scalar_ms = (time.perf_counter() - t) * 1000
+    t = time.perf_counter()
+    zodiac_of_dates(births)
+    vector_ms = (time.perf_counter() - t) * 1000
+    t = time.perf_counter()
+    generate(rows, date.today(), io.StringIO())
+    roster_ms = (time.perf_counter() - t) * 1000
+    return {"get_zodiac_total_ms": scalar_ms, "get_zodiac_per_call_us": scalar_ms * 1000 / size,
+            "zodiac_of_dates_ms": vector_ms, "roster_generate_ms": roster_ms}
+
+def run(rows, jobs, roster, ext, repeat):
+    results = {"emotion": {}, "catalog": {}, "zodiac": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = name = None
+        for n in rows:
+            results["emotion"][str(n)], journal, name = bench_emotion(n, os.path.join(tmp, "data"), ext, repeat)
+            print(f"emotion {n}: ok", file=sys.stderr)
+        if journal is not None:
+            results["reports"] = bench_reports(journal, name, repeat)
+        for n in jobs:
+            results["catalog"][str(n)] = bench_catalog(n, tmp, repeat)
+            print(f"catalog {n}: ok", file=sys.stderr)
+    for n in roster:
+        results["zodiac"][str(n)] = bench_zodiac(n)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="세 앱의 핫패스 실행 시간을 잰다")
+    parser.add_argument("--rows", type=int, nargs="*", default=[1000, 100000, 1000000], help="감정 기록 행 수 (최대 1천만)")
+    parser.add_argument("--jobs", type=int, nargs="*", default=[1000, 10000, 100000], help="직업 카탈로그 크기")
+    parser.add_argument("--roster", type=int, nargs="*", default=[100000], help="명단 인원")
+    parser.add_argument("--ext", default=".csv", help="감정 기록 저장 형식 (.csv .log.csv .sqlite .feather .parquet)")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--save", action="store_true", help="bench/results/hotpaths.jsonl 에 결과를 덧붙인다")
+    parser.add_argument("--threshold", type=float, default=1.2, help="직전 기록 대비 이 배율 이상이면 회귀로 표시")
+    args = parser.parse_args()
+    results = run(args.rows, args.jobs, args.roster, args.ext, args.repeat)
+    print(json.dumps(results, ensure_ascii=False, indent=1))
+    errors = record.report("hotpaths", results, args.save, args.threshold)
+    raise SystemExit(1 if errors else 0)
+
+if __name__ == "__main__":
+    main()
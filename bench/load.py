@@ -0,0 +1,154 @@
+# bench/load.py
+# 👥 동시 세션 부하 테스트 (Streamlit AppTest)
+# - 작업 프로세스 concurrency 개를 동시에 띄우고, 각 프로세스는 맡은 세션들을 차례로 돌린다
+#   (AppTest 는 한 프로세스 안의 여러 스레드에서 동시에 돌리면 불안정해서 프로세스로 나눈다)
+# - 세션마다 사용자/입력을 바꿔 (감정 기록 저장, MBTI 변경, 운세 보기) 프로세스 안의 공유 캐시를 함께 쓴다
+# - rerun 지연 p50/p95/최대, 작업 프로세스별 메모리(RSS / tracemalloc) 증가량을 본다
+# 앱은 임시 폴더에서 돌린다 (data/ 가 저장소에 생기지 않게, jobs.json 은 복사).
+# 세션에서 오류가 나면 결과에 error_count 가 남고 0 이 아닌 종료 코드로 끝난다.
+# 사용법 (저장소 루트에서):
+#   python bench/load.py --sessions 50 --rounds 10 --concurrency 8
+#   python bench/load.py --apps app.py --save     # bench/results/load.jsonl 에 기록
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import record  # 저장소 루트를 sys.path 에 넣는다
+
+from perf import percentile
+
+ROOT = record.ROOT
+APPS = ["app.py", "main.py", "test.py"]
+
+# --- 앱별 한 번의 사용자 동작 (session, round) ---
+def _button(at, label):
+    for b in at.button:
+        if b.label == label:
+            return b
+    raise LookupError(f"버튼 없음: {label}")
+
+def _emotion_step(at, session, rnd):
+    from emotion_core import EMOTIONS
+    if rnd == 0:
+        at.sidebar.text_input[0].set_value(f"부하{session}")
+        return
+    at.selectbox[0].set_value(EMOTIONS[(session + rnd) % len(EMOTIONS)])
+    _button(at, "기록 저장").click()
+
+def _career_step(at, session, rnd):
+    options = at.sidebar.selectbox[0].options
+    at.sidebar.selectbox[0].set_value(options[(session + rnd) % len(options)])
+
+def _zodiac_step(at, session, rnd):
+    if rnd == 0:
+        at.text_input[0].set_value(f"부하{session}")
+    _button(at, "오늘의 운세 보기").click()
+
+STEPS = {"app.py": _emotion_step, "main.py": _career_step, "test.py": _zodiac_step}
+
+# --- 작업 프로세스 ---
+def _run_session(app, session, rounds, latencies):
+    # 잰 지연은 바로 latencies 에 넣는다 (중간에 실패해도 그때까지의 값은 남는다)
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(os.path.join(ROOT, app), default_timeout=120)
+    for rnd in range(-1, rounds):
+        if rnd >= 0:
+            STEPS[app](at, session, rnd)
+        t = time.perf_counter()
+        at.run()
+        latencies.append((time.perf_counter() - t) * 1000)
+        if at.exception:
+            raise RuntimeError(f"{app} 세션 {session}: {at.exception[0].message}")
+
+def worker(app, sessions, rounds, trace):
+    # 현재 폴더(임시 폴더)에서 sessions 를 차례로 돌리고 결과를 JSON 한 줄로 출력한다
+    if trace:
+        tracemalloc.start()
+    latencies, errors = [], []
+    rss_start = record.rss_mb()
+    for session in sessions:
+        try:
+            _run_session(app, session, rounds, latencies)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+    print(json.dumps({
+        "latencies": latencies, "errors": errors,
+        "rss_start_mb": rss_start, "rss_end_mb": record.rss_mb(),
+        "traced_mb": tracemalloc.get_traced_memory()[0] / 2**20 if trace else 0.0,
+    }, ensure_ascii=False))
+
+# --- 부하 실행 ---
+def run_app(app, sessions, rounds, concurrency, cwd, trace=False):
+    procs = []
+    t = time.perf_counter()
+    for w in range(concurrency):
+        ids = [str(i) for i in range(w, sessions, concurrency)]
+        if not ids:
+            continue
+        cmd = [sys.executable, os.path.abspath(__file__), "--worker", app, "--rounds", str(rounds), "--ids", *ids]
+        if trace:
+            cmd.append("--trace")
+        procs.append(subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True))
+    latencies, errors, growth, traced = [], [], [], []
+    for p in procs:
+        out, err = p.communicate()
+        try:
+            data = json.loads(out.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            errors.append(f"작업 프로세스 실패 (종료 코드 {p.returncode}): {err.strip().splitlines()[-1] if err.strip() else ''}")
+            continue
+        latencies.extend(data["latencies"])
+        errors.extend(data["errors"])
+        growth.append(data["rss_end_mb"] - data["rss_start_mb"])
+        traced.append(data["traced_mb"])
+    wall = time.perf_counter() - t
+    result = {
+        "sessions": sessions, "workers": len(procs), "reruns": len(latencies), "wall_s": wall,
+        "rerun_p50_ms": percentile(latencies, 50), "rerun_p95_ms": percentile(latencies, 95),
+        "rerun_max_ms": max(latencies) if latencies else None,
+        "rss_growth_max_mb": max(growth) if growth else None,
+        "rss_growth_total_mb": sum(growth),
+        "traced_max_mb": max(traced) if traced else None,
+    }
+    if errors:
+        result["errors"] = errors[:5]
+        result["error_count"] = len(errors)
+    return result
+
+def run(apps, sessions, rounds, concurrency, trace=False):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(os.path.join(ROOT, "jobs.json"), tmp)
+        for app in apps:
+            results[app] = run_app(app, sessions, rounds, concurrency, tmp, trace)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 세션을 동시에 돌려 rerun 지연과 메모리 증가를 잰다")
+    parser.add_argument("--apps", nargs="*", default=APPS, choices=APPS)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=10, help="세션마다 첫 실행 뒤 반복할 동작 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시에 돌리는 작업 프로세스 수")
+    parser.add_argument("--trace", action="store_true", help="tracemalloc 으로 파이썬 객체 메모리도 잰다 (느려짐)")
+    parser.add_argument("--save", action="store_true", help="bench/results/load.jsonl 에 결과를 덧붙인다")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    parser.add_argument("--worker", choices=APPS, help=argparse.SUPPRESS)
+    parser.add_argument("--ids", type=int, nargs="*", default=[], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        worker(args.worker, args.ids, args.rounds, args.trace)
+        return
+    results = run(args.apps, args.sessions, args.rounds, args.concurrency, args.trace)
+    print(json.dumps(results, ensure_ascii=False, indent=1))
+    errors = record.report("load", results, args.save, args.threshold)
+    raise SystemExit(1 if errors else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# bench/record.py
+# 🗂️ 벤치마크 결과 기록 / 비교
+# - bench/results/<종류>.jsonl 에 실행마다 한 줄 (커밋, 시각, 파이썬 버전, 결과)
+# - rss_mb: 현재 프로세스 메모리
+# - compare: 직전 기록과 비교해 시간(_ms/_s)·메모리(_mb) 값이 threshold 배 이상 늘어난 항목을 돌려준다
+# - report: 비교 결과 출력 + 저장, 오류 수를 돌려준다
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+RESULTS_DIR = os.path.join(ROOT, "bench", "results")
+METRIC_SUFFIXES = ("_ms", "_s", "_mb")
+
+def git_commit(root=ROOT):
+    out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True)
+    return out.stdout.strip() if out.returncode == 0 else None
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # 최대치 (Linux 외)
+
+def _path(kind):
+    return os.path.join(RESULTS_DIR, f"{kind}.jsonl")
+
+def previous(kind):
+    path = _path(kind)
+    if not os.path.exists(path):
+        return None
+    last = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                last = json.loads(line)
+    return last
+
+def save(kind, results, root=ROOT):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    record = {"commit": git_commit(root), "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "python": platform.python_version(), "results": results}
+    with open(_path(kind), "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return record
+
+def _flatten(value, prefix=""):
+    if isinstance(value, dict):
+        for k, v in value.items():
+            yield from _flatten(v, f"{prefix}/{k}" if prefix else str(k))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool) and prefix.endswith(METRIC_SUFFIXES):
+        yield prefix, value
+
+def compare(before, after, threshold=1.2):
+    # [(항목, 이전 값, 이번 값, 배율)] — 배율이 threshold 이상인 것만 (이전 값이 0 이면 늘어난 것 모두)
+    old = dict(_flatten(before))
+    regressions = []
+    for key, new in _flatten(after):
+        if key not in old:
+            continue
+        if old[key]:
+            ratio = new / old[key]
+        else:
+            ratio = float("inf") if new > 0 else 1.0
+        if ratio >= threshold:
+            regressions.append((key, old[key], new, ratio))
+    return regressions
+
+def error_count(results):
+    # 결과 안의 "error" 항목 수 + "error_count" 합계
+    if not isinstance(results, dict):
+        return 0
+    count = int(results.get("error_count") or 0) + (1 if "error" in results else 0)
+    return count + sum(error_count(v) for v in results.values())
+
+def report(kind, results, save_result=False, threshold=1.2, root=ROOT):
+    # 직전 기록과 비교해 출력하고, save_result 면 이번 결과를 덧붙인다 (오류가 있으면 저장하지 않음).
+    # 오류 수를 돌려준다 (0 이 아니면 호출한 쪽이 0 이 아닌 종료 코드로 끝낸다)
+    prev = previous(kind)
+    if prev is not None:
+        regressions = compare(prev["results"], results, threshold)
+        print(f"[{kind}] 직전 기록({prev['commit']}, {prev['ts']}) 대비 {threshold:.1f}배 이상 느려진 항목: {len(regressions)}")
+        for key, old, new, ratio in regressions:
+            print(f"  {key}: {old:.3f} -> {new:.3f} (x{ratio:.2f})")
+    errors = error_count(results)
+    if errors:
+        print(f"[{kind}] 오류 {errors}건 — 결과를 저장하지 않습니다")
+    elif save_result:
+        save(kind, results, root)
+    return errors
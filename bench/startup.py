@@ -0,0 +1,106 @@
+# bench/startup.py
+# ⏱️ 시작 시간 측정
+# - 앱 스크립트가 맨 위에서 import 하는 모듈(streamlit 제외)을 새 프로세스에서 import 하는 데 걸리는 시간 (cold start)
+# - import 후 matplotlib / fpdf 가 올라왔는지 (올라오면 안 된다)
+# - streamlit 이 있으면 AppTest 로 각 앱의 첫 화면 실행 시간 (새 프로세스, streamlit import 포함)
+# 첫 화면은 임시 폴더에서 실행한다 (app.py 가 저장소에 data/ 를 만들지 않게, jobs.json 은 복사).
+# --root 로 다른 체크아웃(git worktree 등)을 재면 커밋 사이 전/후를 비교할 수 있다.
+# 사용법 (저장소 루트에서): python bench/startup.py [--repeat 5] [--root DIR] [--save]
+
+import argparse
+import ast
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import record
+
+ROOT = record.ROOT
+APPS = ["app.py", "main.py", "test.py"]
+HEAVY = ["matplotlib", "fpdf"]
+
+IMPORT_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+for m in sys.argv[1:]:
+    __import__(m)
+elapsed = time.perf_counter() - t
+print(json.dumps({"seconds": elapsed, "loaded": [h for h in %r if h in sys.modules]}))
+""" % (HEAVY,)
+
+RENDER_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+AppTest.from_file(sys.argv[1], default_timeout=60).run()
+print(json.dumps({"seconds": time.perf_counter() - t}))
+"""
+
+def app_imports(root, app):
+    # 앱 스크립트가 맨 위에서 import 하는 모듈 (streamlit 제외, 순서 유지)
+    with open(os.path.join(root, app), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            names = [node.module]
+        else:
+            continue
+        modules.extend(n for n in names if n.split(".")[0] != "streamlit" and n not in modules)
+    return modules
+
+def _probe(code, args, cwd, root):
+    env = dict(os.environ, PYTHONPATH=root)
+    out = subprocess.run([sys.executable, "-c", code, *args], cwd=cwd, env=env, capture_output=True, text=True)
+    if out.returncode != 0:
+        return {"error": out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "failed"}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def _median(runs, entry, key):
+    ok = [r for r in runs if "error" not in r]
+    if ok:
+        entry[key] = statistics.median(r["seconds"] for r in ok)
+    else:
+        entry["error"] = runs[0]["error"]
+    return ok
+
+def measure(repeat=5, render=True, root=ROOT):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(os.path.join(root, "jobs.json"), tmp)
+        for app in APPS:
+            modules = app_imports(root, app)
+            entry = {"modules": modules}
+            ok = _median([_probe(IMPORT_PROBE, modules, root, root) for _ in range(repeat)], entry, "import_median_s")
+            if ok:
+                entry["heavy_loaded"] = sorted({h for r in ok for h in r["loaded"]})
+            if render:
+                runs = [_probe(RENDER_PROBE, [os.path.join(root, app)], tmp, root) for _ in range(repeat)]
+                if not any("error" not in r for r in runs):
+                    entry["render_error"] = runs[0]["error"]
+                else:
+                    _median(runs, entry, "first_render_median_s")
+            results[app] = entry
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="앱이 import 하는 모듈의 import 시간과 첫 화면 실행 시간을 잰다")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-render", action="store_true", help="AppTest 첫 화면 측정 생략")
+    parser.add_argument("--root", default=ROOT, help="잴 체크아웃 경로 (기본: 이 저장소)")
+    parser.add_argument("--save", action="store_true", help="bench/results/startup.jsonl 에 결과를 덧붙인다")
+    args = parser.parse_args()
+    root = os.path.abspath(args.root)
+    results = measure(args.repeat, not args.no_render, root)
+    print(json.dumps(results, ensure_ascii=False, indent=1))
+    errors = record.report("startup", results, args.save, root=root)
+    raise SystemExit(1 if errors else 0)
+
+if __name__ == "__main__":
+    main()
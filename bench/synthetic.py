@@ -0,0 +1,77 @@
+# bench/synthetic.py
+# 🧪 벤치마크용 가짜 데이터
+# - emotion_history: 감정 기록 (1천 ~ 1천만 행, NumPy 로 한 번에 만든다)
+# - job_catalog: jobs.json 의 직업을 변형해 늘린 카탈로그 (최대 10만 개 이상)
+# - roster: 이름/생일 명단
+# seed 가 같으면 항상 같은 데이터가 나온다 (커밋 사이 비교용)
+
+import csv
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from emotion_core import EMOTIONS
+
+# --- 감정 기록 ---
+def emotion_history(rows, days=365, end=None, seed=0):
+    # end 이전 days 일 동안 고르게 흩어진 기록 (시간순)
+    rng = np.random.default_rng(seed)
+    end = end or datetime.now().replace(microsecond=0)
+    start = np.datetime64(end - timedelta(days=days), "us")
+    offsets = np.sort(rng.integers(0, days * 86400 * 10**6, rows)).astype("timedelta64[us]")
+    ts = pd.DatetimeIndex(start + offsets)
+    return pd.DataFrame({
+        "timestamp": ts,
+        "date": ts.strftime("%Y-%m-%d"),
+        "time": ts.strftime("%H:%M:%S"),
+        "emotion": np.array(EMOTIONS, dtype=object)[rng.integers(0, len(EMOTIONS), rows)],
+        "note": "",
+    })
+
+# --- 직업 카탈로그 ---
+def job_catalog(size, base_path=os.path.join(ROOT, "jobs.json"), seed=0):
+    # 원래 직업의 제목/스킬을 섞어 size 개를 만든다
+    with open(base_path, encoding="utf-8") as f:
+        base = json.load(f)
+    rng = np.random.default_rng(seed)
+    mbti_types = sorted({j["mbti"] for j in base})
+    skills = sorted({s for j in base for s in j["skills"]})
+    jobs = []
+    for i in range(size):
+        src = base[i % len(base)]
+        picked = rng.choice(len(skills), size=3, replace=False)
+        jobs.append({
+            "mbti": mbti_types[rng.integers(len(mbti_types))],
+            "title": f"{src['title']} {i}",
+            "desc": src["desc"],
+            "skills": [skills[k] for k in picked],
+            "icon": src.get("icon", ""),
+        })
+    return jobs
+
+def write_catalog(jobs, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(jobs, f, ensure_ascii=False)
+    return path
+
+# --- 명단 ---
+def roster(size, seed=0):
+    rng = np.random.default_rng(seed)
+    first = date(1950, 1, 1)
+    births = rng.integers(0, (date(2020, 12, 31) - first).days, size)
+    return [{"name": f"사용자{i}", "birth": (first + timedelta(days=int(b))).isoformat()} for i, b in enumerate(births)]
+
+def write_roster(rows, path):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["name", "birth"])
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
@@ -0,0 +1,39 @@
+# career_cards.py
+# 🃏 직업 카드 HTML
+# - 한 페이지의 카드 전체를 HTML 조각 하나로 만든다 (st.markdown 한 번 = 메시지 하나)
+# - 직업명/설명/스킬은 HTML 이스케이프
+# - 추천 결과 CSV (pandas 없이)
+
+import csv
+import io
+from html import escape
+
+def page_count(total, page_size):
+    return max((total + page_size - 1) // page_size, 1)
+
+def page_slice(page, page_size):
+    # page 는 1부터
+    start = (page - 1) * page_size
+    return slice(start, start + page_size)
+
+def card_html(job, fit=None):
+    fit_label = f" · {escape(job.mbti)} · 적합도 {fit:.0%}" if fit is not None else ""
+    skills = "".join(f"<span class='skill'>{escape(s)}</span>" for s in job.skills)
+    return (
+        "<div class='job-card'>"
+        f"<b>{escape(job.icon)} {escape(job.title)}</b>{fit_label}"
+        f"<div class='small'>{escape(job.desc)}</div>"
+        f"<div style='margin-top:8px'>{skills}</div>"
+        "</div>"
+    )
+
+def cards_html(jobs, fits=None):
+    fits = fits or [None] * len(jobs)
+    return "".join(card_html(job, fit) for job, fit in zip(jobs, fits))
+
+def results_csv(jobs):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["직업", "설명", "스킬", "MBTI"])
+    writer.writerows([job.title, job.desc, ", ".join(job.skills), job.mbti] for job in jobs)
+    return out.getvalue().encode('utf-8-sig')
@@ -0,0 +1,85 @@
+# career_catalog.py
+# 📚 직업 카탈로그
+# - jobs.json (객체 목록) 또는 CSV (mbti,title,desc,skills,icon / 스킬은 "|" 로 구분) 에서 읽는다
+# - 서버 프로세스당 한 번만 읽어 모든 세션이 같은 객체를 공유하고,
+#   파일 수정 시각(mtime)이 바뀌었을 때만 다시 읽는다
+# - 직업은 __slots__ 객체로 두어 dict 보다 메모리를 덜 쓴다
+# - match_job / rank_jobs / find_jobs: 화면 없이도 쓸 수 있는 검색 함수
+
+import csv
+import json
+import os
+import threading
+
+from career_index import JobIndex
+from perf import timed
+
+JOBS_FILE = "jobs.json"
+
+class Job:
+    __slots__ = ("mbti", "title", "desc", "skills", "icon")
+
+    def __init__(self, mbti, title, desc, skills, icon=""):
+        self.mbti = mbti
+        self.title = title
+        self.desc = desc
+        self.skills = tuple(skills)
+        self.icon = icon
+
+class Catalog:
+    __slots__ = ("path", "mtime", "jobs", "index")
+
+    def __init__(self, path, mtime, jobs):
+        self.path = path
+        self.mtime = mtime
+        self.jobs = tuple(jobs)
+        self.index = JobIndex(self.jobs)
+
+def _read_json(path):
+    with open(path, encoding="utf-8") as f:
+        rows = json.load(f)
+    return [Job(r["mbti"], r["title"], r["desc"], r["skills"], r.get("icon", "")) for r in rows]
+
+def _read_csv(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return [Job(r["mbti"], r["title"], r["desc"], [s.strip() for s in r["skills"].split("|") if s.strip()], r.get("icon") or "")
+                for r in csv.DictReader(f)]
+
+@timed("career.load_catalog")
+def load_catalog(path):
+    mtime = os.stat(path).st_mtime_ns
+    jobs = _read_csv(path) if path.lower().endswith(".csv") else _read_json(path)
+    return Catalog(path, mtime, jobs)
+
+_catalogs = {}
+_lock = threading.Lock()
+
+def get_catalog(path):
+    # 매 rerun 마다 stat 한 번만 하고, 파일이 바뀌었을 때만 다시 만든다
+    mtime = os.stat(path).st_mtime_ns
+    catalog = _catalogs.get(path)
+    if catalog is not None and catalog.mtime == mtime:
+        return catalog
+    with _lock:
+        catalog = _catalogs.get(path)
+        if catalog is None or catalog.mtime != mtime:
+            catalog = load_catalog(path)
+            _catalogs[path] = catalog
+        return catalog
+
+# --- 검색 ---
+@timed("career.match_job")
+def match_job(mbti, keyword="", skill_filter=(), path=JOBS_FILE):
+    return get_catalog(path).index.match(mbti, keyword, skill_filter)
+
+@timed("career.rank_jobs")
+def rank_jobs(mbti, keyword="", skill_filter=(), k=10, path=JOBS_FILE):
+    # MBTI 유사도 + 키워드 + 스킬 겹침 점수 상위 k 개
+    return get_catalog(path).index.rank(mbti, keyword, skill_filter, k=k)
+
+def find_jobs(mbti, keyword="", skill_filter=(), top_k=None, path=JOBS_FILE):
+    # (직업 목록, 적합도 목록 또는 None). top_k 가 있으면 순위 모드
+    if top_k:
+        ranked = rank_jobs(mbti, keyword, skill_filter, top_k, path)
+        return [job for job, _ in ranked], [score for _, score in ranked]
+    return match_job(mbti, keyword, skill_filter, path), None
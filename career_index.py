@@ -0,0 +1,120 @@
+# career_index.py
+# 🧭 직업 검색 인덱스
+# - MBTI -> 직업 id 비트셋
+# - 스킬 -> 직업 id 비트셋 (여러 스킬은 AND)
+# - 키워드: 직업명/설명/스킬의 1·2글자 조각(n-gram) -> 직업 id 집합으로 후보를 좁히고
+#   3글자 이상이면 후보만 실제 부분 문자열 검사
+# 비트셋은 파이썬 정수(비트 i = 직업 id i)라 AND 는 C 수준에서 한 번에 끝난다.
+# - rank(): MBTI 4축 벡터 유사도 + 키워드 일치 + 스킬 겹침을 NumPy 로 한 번에 점수 매기고
+#   argpartition 으로 상위 k 개만 고른다 (정확히 같은 유형이 아니어도 결과가 나온다)
+
+import numpy as np
+
+def _grams(text):
+    # 1글자 + 2글자 조각
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+def _bits(ids, n):
+    buf = bytearray((n + 7) // 8)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+def _ids(bits, n):
+    # 켜진 비트의 id 를 낮은 번호부터 (원래 목록 순서)
+    if not bits:
+        return []
+    raw = np.frombuffer(bits.to_bytes((n + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little")).tolist()
+
+MBTI_AXES = ("EI", "SN", "TF", "JP")
+RANK_WEIGHTS = {"type": 0.6, "keyword": 0.25, "skills": 0.15}
+
+def mbti_vector(mbti):
+    # 각 축 첫 글자면 +1, 둘째 글자면 -1, 알 수 없으면 0
+    vec = np.zeros(4, dtype=np.int8)
+    for axis, (letter, pair) in enumerate(zip(mbti.upper(), MBTI_AXES)):
+        if letter in pair:
+            vec[axis] = 1 if letter == pair[0] else -1
+    return vec
+
+def _mask(bits, n):
+    if not bits:
+        return np.zeros(n, dtype=bool)
+    raw = np.frombuffer(bits.to_bytes((n + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, count=n, bitorder="little").astype(bool)
+
+class JobIndex:
+    def __init__(self, jobs):
+        self.jobs = tuple(jobs)
+        n = len(self.jobs)
+        self.all_bits = (1 << n) - 1
+        mbti_ids, skill_ids = {}, {}
+        self.by_gram = {}
+        self._fields = []  # id -> (소문자 직업명, 소문자 설명, 소문자 스킬들)
+        for i, job in enumerate(self.jobs):
+            mbti_ids.setdefault(job.mbti, []).append(i)
+            for s in job.skills:
+                skill_ids.setdefault(s, []).append(i)
+            fields = (job.title.lower(), job.desc.lower(), tuple(s.lower() for s in job.skills))
+            self._fields.append(fields)
+            grams = _grams(fields[0]) | _grams(fields[1])
+            for s in fields[2]:
+                grams |= _grams(s)
+            for g in grams:
+                self.by_gram.setdefault(g, set()).add(i)
+        self.by_mbti = {m: _bits(ids, n) for m, ids in mbti_ids.items()}
+        self.by_skill = {s: _bits(ids, n) for s, ids in skill_ids.items()}
+        self.vectors = np.array([mbti_vector(job.mbti) for job in self.jobs], dtype=np.int8).reshape(n, 4)
+        self.mbti_list = sorted(self.by_mbti)
+        self.skill_options = sorted(self.by_skill)
+
+    def _keyword_ids(self, keyword, ids=None):
+        k = keyword.lower()
+        grams = {k} if len(k) < 2 else {k[i:i + 2] for i in range(len(k) - 1)}
+        postings = sorted((self.by_gram.get(g, set()) for g in grams), key=len)
+        found = set(postings[0]).intersection(*postings[1:]) if ids is None else set(ids).intersection(*postings)
+        if len(k) > 2:
+            found = {i for i in found
+                     if k in self._fields[i][0] or k in self._fields[i][1] or any(k in s for s in self._fields[i][2])}
+        # 조각을 필드별로 만들었으므로 2글자 이하는 조각 일치가 곧 부분 문자열 일치
+        return sorted(found)
+
+    def match_ids(self, mbti=None, keyword="", skills=()):
+        bits = self.all_bits if mbti is None else self.by_mbti.get(mbti, 0)
+        for s in skills:
+            bits &= self.by_skill.get(s, 0)
+        ids = _ids(bits, len(self.jobs))
+        if keyword and ids:
+            ids = self._keyword_ids(keyword, ids)
+        return ids
+
+    def match(self, mbti=None, keyword="", skills=()):
+        return [self.jobs[i] for i in self.match_ids(mbti, keyword, skills)]
+
+    def scores(self, mbti, keyword="", skills=(), weights=RANK_WEIGHTS):
+        # 전체 카탈로그 점수 (0~1)
+        n = len(self.jobs)
+        type_score = (self.vectors @ mbti_vector(mbti).astype(np.int16) + 4) / 8.0
+        score = weights["type"] * type_score
+        if keyword:
+            hit = np.zeros(n)
+            hit[self._keyword_ids(keyword)] = 1.0
+            score += weights["keyword"] * hit
+        if skills:
+            overlap = sum(_mask(self.by_skill.get(s, 0), n).astype(np.float32) for s in skills)
+            score += weights["skills"] * overlap / len(skills)
+        return score
+
+    def rank(self, mbti, keyword="", skills=(), k=10, weights=RANK_WEIGHTS):
+        # 점수 상위 k 개 [(직업, 점수)] (점수 내림차순, 같으면 목록 순서)
+        n = len(self.jobs)
+        if n == 0 or k <= 0:
+            return []
+        score = self.scores(mbti, keyword, skills, weights)
+        k = min(k, n)
+        top = np.argpartition(-score, k - 1)[:k] if k < n else np.arange(n)
+        top = top[np.lexsort((top, -score[top]))]
+        return [(self.jobs[i], float(score[i])) for i in top]
@@ -0,0 +1,89 @@
+# emotion_charts.py
+# 📊 감정 차트 렌더링
+# - 입력(주간 집계 / 날짜별 감정)이 같으면 PNG 바이트를 캐시에서 바로 돌려준다 (LRU)
+# - pyplot 전역 상태를 쓰지 않고 Figure 를 직접 만들어 렌더 후 바로 정리한다
+# - 서버에서 돌기 때문에 화면 없는 Agg 백엔드 사용
+# - matplotlib 은 처음 차트를 그릴 때 불러온다 (앱 시작 시간 단축)
+
+import io
+import threading
+from functools import lru_cache
+
+from emotion_core import EMO_LABELS,SCORE_MAP
+from perf import timed
+
+# ----------------------
+# 설정
+# ----------------------
+CHART_CACHE_SIZE = 128
+
+_render_lock = threading.Lock()
+_Figure = None
+
+def _new_figure():
+    global _Figure
+    if _Figure is None:
+        import matplotlib
+        matplotlib.use("Agg")
+        from matplotlib.figure import Figure
+        _Figure = Figure
+    return _Figure()
+
+def _to_png(fig):
+    buf = io.BytesIO()
+    try:
+        fig.savefig(buf,format="png")
+    finally:
+        fig.clear()
+    return buf.getvalue()
+
+# ----------------------
+# 렌더링 (캐시)
+# ----------------------
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+@timed("chart.render_week")  # 캐시 미스(실제 렌더)만 잰다
+def _week_png(items):
+    with _render_lock:
+        fig = _new_figure()
+        ax = fig.subplots()
+        ax.bar([EMO_LABELS[e] for e,_ in items],[n for _,n in items])
+        ax.set_title("이번 주 감정 분포")
+        ax.set_ylabel("기록 수")
+        ax.tick_params(axis="x",labelrotation=45)
+        for label in ax.get_xticklabels():
+            label.set_horizontalalignment("right")
+        fig.tight_layout()
+        return _to_png(fig)
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+@timed("chart.render_calendar")
+def _calendar_png(items):
+    with _render_lock:
+        dates = [d for d,_ in items]
+        scores = [SCORE_MAP[e] if e else float("nan") for _,e in items]
+        fig = _new_figure()
+        ax = fig.subplots()
+        ax.plot(dates,scores,marker="o")
+        ax.set_ylim(-0.5,4.5)
+        ax.set_yticks([0,1,2,3,4])
+        ax.set_yticklabels(["neg","tired","neutral","happy","very\nhappy"])
+        ax.set_title("주간 감정 캘린더")
+        ax.tick_params(axis="x",labelrotation=45)
+        fig.tight_layout()
+        return _to_png(fig)
+
+# ----------------------
+# 공개 함수 (매번 새 버퍼를 돌려준다)
+# ----------------------
+@timed("chart.week_plot")
+def create_week_plot(counts):
+    items = tuple((e,int(n)) for e,n in counts.items())
+    return io.BytesIO(_week_png(items))
+
+@timed("chart.calendar_plot")
+def create_calendar_plot(day_emotion):
+    return io.BytesIO(_calendar_png(tuple(day_emotion.items())))
+
+def clear_chart_cache():
+    _week_png.cache_clear()
+    _calendar_png.cache_clear()
@@ -0,0 +1,218 @@
+# emotion_core.py
+# 🌈 감정 기록 앱 공통 로직
+# - 감정 목록/라벨/피드백
+# - 주간 범위 계산
+# - 일별 집계(DailyRollup): 하루 감정별 기록 수 + 그날 마지막 감정
+# - 기록 내역 인덱스(HistoryIndex): 정렬된 시간 배열로 건수/경계를 찾고, 한 페이지 행만 저장소에서 읽는다
+
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from perf import span,timed
+
+# ----------------------
+# 설정
+# ----------------------
+EMOTIONS = ["very_happy","happy","neutral","tired","sad","angry","anxious","stressed"]
+EMO_LABELS = {
+    "very_happy":"😊 매우 좋음","happy":"🙂 좋음","neutral":"😐 보통",
+    "tired":"😴 피곤","sad":"😢 우울","angry":"😠 화남","anxious":"😬 불안","stressed":"😣 스트레스"
+}
+FEEDBACK = {
+    "very_happy":("좋아요! 오늘 좋은 일을 축하해요.","친구에게 감사 인사 보내기나 기분을 기록해보세요."),
+    "happy":("기분이 좋군요!","짧은 산책이나 좋아하는 음악을 들으며 즐거운 시간을 보내보세요."),
+    "neutral":("보통인 하루네요.","가벼운 스트레칭이나 5분 명상으로 기분을 끌어올려보세요."),
+    "tired":("피곤하군요.","짧은 낮잠(15~20분)이나 휴식 시간을 추천합니다."),
+    "sad":("힘든 날이군요.","가까운 사람에게 이야기해보거나, 따뜻한 차 한 잔을 추천합니다."),
+    "angry":("화가 난 상태네요.","심호흡 4-4-4(들4-참4-내4) 1분 수행 권장."),
+    "anxious":("불안하네요.","짧은 산책이나 5분 호흡 명상이 도움이 됩니다."),
+    "stressed":("스트레스가 많아 보입니다.","해야 할 일을 작은 단위로 쪼개서 하나씩 처리해보세요.")
+}
+SCORE_MAP = {"very_happy":4,"happy":3,"neutral":2,"tired":1,"sad":0,"angry":0,"anxious":0,"stressed":0}
+
+# ----------------------
+# 일별 집계
+# ----------------------
+class DailyRollup:
+    # 전체 기록을 한 번만 훑어 만들고, 이후에는 add()로 한 건씩 갱신한다.
+    # 주간 통계는 기간 안의 날짜 수만큼만 본다 (전체 기록 수와 무관).
+    def __init__(self):
+        self.counts = {}  # date -> {emotion: 기록 수}
+        self.last = {}    # date -> (timestamp, emotion)
+        self.version = 0  # add() 할 때마다 증가 (파생 캐시 무효화용)
+        self._lock = threading.Lock()
+
+    @classmethod
+    @timed("emotion.rollup_build")
+    def from_frame(cls,df):
+        rollup = cls()
+        if df.empty:
+            return rollup
+        with span("emotion.to_datetime"):
+            ts = pd.to_datetime(df["timestamp"])
+        frame = pd.DataFrame({"timestamp":ts.values,"day":ts.dt.date.values,"emotion":df["emotion"].values})
+        frame = frame[frame["emotion"].notna()]  # EMOTIONS 에 없는 감정(NaN)은 집계에도 마지막 감정에도 넣지 않는다
+        for (day,emo),n in frame.groupby(["day","emotion"],observed=True).size().items():
+            rollup.counts.setdefault(day,{})[emo] = int(n)
+        last = frame.sort_values("timestamp",kind="stable").groupby("day").tail(1)
+        for day,t,emo in zip(last["day"],last["timestamp"],last["emotion"]):
+            rollup.last[day] = (pd.Timestamp(t).to_pydatetime(),emo)
+        return rollup
+
+    def add(self,entry):
+        ts = entry["timestamp"]
+        day,emo = ts.date(),entry["emotion"]
+        with self._lock:
+            day_counts = self.counts.setdefault(day,{})
+            day_counts[emo] = day_counts.get(emo,0)+1
+            if day not in self.last or ts>=self.last[day][0]:
+                self.last[day] = (ts,emo)
+            self.version += 1
+
+    def daily_counts(self):
+        # 추세 계산용 복사본 {date: {emotion: 기록 수}}
+        with self._lock:
+            return {d:dict(c) for d,c in self.counts.items()}
+
+    def counts_between(self,start,end):
+        total = dict.fromkeys(EMOTIONS,0)
+        d = start
+        while d<=end:
+            for emo,n in self.counts.get(d,{}).items():
+                if emo in total:
+                    total[emo] += n
+            d += timedelta(days=1)
+        return pd.Series(total,name="count")
+
+    def last_emotion(self,day):
+        last = self.last.get(day)
+        return last[1] if last else None
+
+# ----------------------
+# 기록 내역 (페이지 조회)
+# ----------------------
+class HistoryIndex:
+    # 압축 표현(load_compact)의 시간만 한 번 정렬해 들고 있고(sorted_ts), 건수/페이지 경계는 여기서 이분 탐색한다.
+    # 한 페이지의 행(감정, 메모)은 load_days(시작일, 끝일, 예상 행 수) 로 그 페이지가 걸친 날짜만 저장소에서 읽고
+    # date/time 은 timestamp 에서 만든다. 마지막으로 읽은 날짜 구간은 들고 있다가 rerun/새 기록에 다시 쓴다.
+    # 새 기록은 add()로 모아 두었다가 다음 조회 때 정렬 위치에 끼워 넣는다.
+    COLUMNS = ["timestamp","date","time","emotion","note"]
+
+    @timed("emotion.history_build")
+    def __init__(self,compact,load_days):
+        with span("emotion.to_datetime"):
+            ts = pd.to_datetime(compact["timestamp"]).to_numpy()
+        self.sorted_ts = np.sort(ts,kind="stable")
+        self.load_days = load_days
+        self._days = None  # (시작일, 끝일, 그 날짜들의 행 — 저장소 순서)
+        self._new = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.sorted_ts)+len(self._new)
+
+    def add(self,entry):
+        with self._lock:
+            self._new.append(entry)
+
+    def _fold(self):
+        with self._lock:
+            if not self._new:
+                return
+            new,self._new = self._new,[]
+            new_ts = np.sort(pd.to_datetime([e["timestamp"] for e in new]).to_numpy(),kind="stable")
+            pos = np.searchsorted(self.sorted_ts,new_ts,side="right")
+            self.sorted_ts = np.insert(self.sorted_ts,pos,new_ts)
+            if self._days is not None:
+                # 들고 있는 날짜 구간에 들어가는 새 기록은 저장소에 붙은 순서대로 뒤에 붙인다
+                first,last,rows = self._days
+                added = [{"timestamp":pd.Timestamp(e["timestamp"]),"emotion":e["emotion"],"note":e["note"]}
+                         for e in new if first<=e["timestamp"].date()<=last]
+                if added:
+                    self._days = (first,last,pd.concat([rows,pd.DataFrame(added)],ignore_index=True))
+
+    def _day_start(self,day):
+        return np.searchsorted(self.sorted_ts,pd.Timestamp(day).to_datetime64(),side="left")
+
+    def _bounds(self,start,end):
+        # start/end 는 날짜(포함). 정렬된 시간 배열에서 이분 탐색
+        self._fold()
+        lo,hi = 0,len(self.sorted_ts)
+        if start is not None:
+            lo = self._day_start(start)
+        if end is not None:
+            hi = self._day_start(end+timedelta(days=1))
+        return lo,max(hi,lo)
+
+    def _read(self,first,last,expected):
+        rows = self.load_days(first,last,expected)
+        return pd.DataFrame({"timestamp":pd.to_datetime(rows["timestamp"],format="mixed"),
+                             "emotion":rows["emotion"].astype(object),"note":rows["note"]})
+
+    def _sorted(self,rows,first,last):
+        if self._days[0]!=first or self._days[1]!=last:
+            ts = rows["timestamp"]
+            rows = rows[(ts>=pd.Timestamp(first))&(ts<pd.Timestamp(last+timedelta(days=1)))]
+        return rows.iloc[np.argsort(rows["timestamp"].to_numpy(),kind="stable")]
+
+    def _rows(self,first,last):
+        # first~last 날짜의 행 (시간순, 같은 시각은 저장 순서). 들고 있는 구간이 이 날짜들을 덮고
+        # 건수가 맞으면 다시 읽지 않는다 (안 맞으면 다른 곳에서 저장소가 바뀐 것이라 새로 읽는다)
+        lo,hi = self._day_start(first),self._day_start(last+timedelta(days=1))
+        cached = self._days
+        if cached is None or cached[0]>first or cached[1]<last or \
+                self._day_start(cached[1]+timedelta(days=1))-self._day_start(cached[0])!=len(cached[2]):
+            self._days = (first,last,self._read(first,last,int(hi-lo)))
+        rows = self._sorted(self._days[2],first,last)
+        if not np.array_equal(rows["timestamp"].to_numpy(),self.sorted_ts[lo:hi]):
+            # 끝부분만 읽다 행 경계를 잘못 잡았거나 다른 프로세스가 썼다: 예상 건수 없이 전부 다시 읽는다
+            self._days = (first,last,self._read(first,last,None))
+            rows = self._sorted(self._days[2],first,last)
+        return rows
+
+    def count(self,start=None,end=None):
+        lo,hi = self._bounds(start,end)
+        return hi-lo
+
+    @timed("emotion.history_page")
+    def page(self,page=0,page_size=50,start=None,end=None):
+        # 최신순 page 번째 페이지와 (기간 안의) 전체 건수를 돌려준다
+        lo,hi = self._bounds(start,end)
+        total = hi-lo
+        top = hi-page*page_size
+        bottom = max(lo,top-page_size)
+        if top<=bottom:
+            return pd.DataFrame(columns=self.COLUMNS),total
+        first = pd.Timestamp(self.sorted_ts[bottom]).date()
+        last = pd.Timestamp(self.sorted_ts[top-1]).date()
+        base = self._day_start(first)
+        rows = self._rows(first,last).iloc[bottom-base:top-base].iloc[::-1]
+        ts = rows["timestamp"]
+        return pd.DataFrame({"timestamp":ts.to_numpy(),
+                             "date":ts.dt.strftime("%Y-%m-%d").to_numpy(),
+                             "time":ts.dt.strftime("%H:%M:%S").to_numpy(),
+                             "emotion":rows["emotion"].to_numpy(),
+                             "note":rows["note"].fillna("").to_numpy()}),total
+
+# ----------------------
+# 주간 분석
+# ----------------------
+def get_week_range(ref_date=None):
+    ref = ref_date if ref_date else datetime.now().date()
+    start = ref - timedelta(days=ref.weekday())
+    end = start + timedelta(days=6)
+    return start,end
+
+@timed("emotion.weekly_counts")
+def weekly_counts(rollup,ref_date=None):
+    start,end = get_week_range(ref_date)
+    return rollup.counts_between(start,end)
+
+@timed("emotion.calendar")
+def emotion_calendar(rollup,ref_date=None):
+    start,end = get_week_range(ref_date)
+    dates = [start+timedelta(days=i) for i in range(7)]
+    return {d:rollup.last_emotion(d) for d in dates}
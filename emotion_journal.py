@@ -0,0 +1,134 @@
+# emotion_journal.py
+# 📔 감정 기록 앱 핵심 로직 (화면 없이 import 가능)
+# - 사용자별 저장소 + 묶음 저장 큐
+# - 사용자별 일별 집계 / 기록 내역 인덱스 / 장기 추세를 만들어 두고 add_entry 때 갱신
+# app.py 는 Journal 하나를 서버 프로세스 전체에서 공유한다.
+# matplotlib / fpdf 는 여기서 import 하지 않는다 (차트·PDF 가 필요할 때 해당 모듈이 불러온다).
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import TimeoutError
+
+from emotion_core import EMOTIONS,DailyRollup,HistoryIndex
+from emotion_storage import PartitionedStorage,WriteQueue,make_entry,import_csv,export_storage
+from emotion_trends import TrendEngine
+from perf import timed
+
+class Journal:
+    def __init__(self,data_dir,ext=".csv",max_users=1000,legacy_file=None,legacy_user="학생"):
+        self.store = PartitionedStorage(data_dir,ext=ext)
+        if legacy_file:
+            # 사용자별 저장 이전의 단일 기록 파일이 남아 있으면 한 번만 옮긴다
+            self.store.migrate_legacy(legacy_file,legacy_user)
+        self.max_users = max_users
+        self._writer = None
+        self._rollups = OrderedDict()
+        self._histories = OrderedDict()
+        self._trends = OrderedDict()  # name -> (rollup, rollup.version, TrendEngine)
+        self._generations = {}  # name -> 저장이 끝날 때마다 1 증가 (만드는 중이던 캐시를 버리는 기준)
+        self._lock = threading.Lock()
+
+    def _cached(self,table,name,build):
+        # 사용자별 캐시 (max_users 를 넘으면 오래 안 쓴 사용자부터 버림)
+        # 만드는 동안 그 사용자의 저장이 끝났으면 빠진 기록이 있을 수 있어 캐시하지 않는다
+        with self._lock:
+            if name in table:
+                table.move_to_end(name)
+                return table[name]
+            generation = self._generations.get(name,0)
+        value = build()
+        with self._lock:
+            if self._generations.get(name,0)!=generation:
+                return value
+            value = table.setdefault(name,value)
+            table.move_to_end(name)
+            while len(table)>self.max_users:
+                table.popitem(last=False)
+        return value
+
+    @property
+    def writer(self):
+        with self._lock:
+            if self._writer is None:
+                self._writer = WriteQueue(self.store)
+            return self._writer
+
+    @timed("emotion.load_data")
+    def load_data(self,name):
+        return self.store.for_user(name).load()
+
+    def rollup(self,name):
+        return self._cached(self._rollups,name,lambda: DailyRollup.from_frame(self.store.for_user(name).load_compact()))
+
+    def history(self,name):
+        # 시간만 들고 있는 인덱스 (메모/date/time 은 보여 줄 페이지만 저장소에서 읽는다)
+        part = self.store.for_user(name)
+        return self._cached(self._histories,name,lambda: HistoryIndex(part.load_compact(),part.load_days))
+
+    def trends(self,name):
+        # 일별 집계가 바뀔 때만 다시 만든다. version 은 집계 객체마다 0 부터 다시 세므로
+        # (가져오기/저장 뒤 새로 만든 집계) 같은 집계 객체인지도 함께 확인한다
+        rollup = self.rollup(name)
+        cached = self._trends.get(name)
+        if cached is not None and cached[0] is rollup and cached[1]==rollup.version:
+            return cached[2]
+        engine = TrendEngine.from_rollup(rollup)
+        with self._lock:
+            self._trends[name] = (rollup,rollup.version,engine)
+            self._trends.move_to_end(name)
+            while len(self._trends)>self.max_users:
+                self._trends.popitem(last=False)
+        return engine
+
+    def invalidate(self,name):
+        with self._lock:
+            self._generations[name] = self._generations.get(name,0)+1
+            for table in (self._rollups,self._histories,self._trends):
+                table.pop(name,None)
+
+    def _written(self,name,entry,rollup,history):
+        # 저장이 끝난 뒤: 세대를 올리고, 저장 전부터 있던 집계/인덱스에는 한 건을 더한다.
+        # 그 사이 다른 세션이 새로 만든 것은 이 기록을 읽었는지 알 수 없으니 버린다
+        with self._lock:
+            self._generations[name] = self._generations.get(name,0)+1
+            for table,cached in ((self._rollups,rollup),(self._histories,history)):
+                if cached is not None:
+                    cached.add(entry)
+                if table.get(name) is not cached:
+                    table.pop(name,None)
+
+    @timed("emotion.add_entry")
+    def add_entry(self,name,emotion,note,when=None,timeout=30):
+        # 전체 파일을 다시 쓰지 않고 한 건만 추가한다 (다른 세션의 기록과 묶어서 저장)
+        # 저장 전에 이미 만들어져 있던 집계/인덱스만 갱신한다 (이후에 만들어지는 것은 디스크에서 읽어 포함)
+        if emotion not in EMOTIONS:
+            raise ValueError(f"알 수 없는 감정입니다: {emotion}")
+        entry = make_entry(emotion,note,when)
+        with self._lock:
+            rollup,history = self._rollups.get(name),self._histories.get(name)
+        future = self.writer.submit(name,entry)
+        try:
+            future.result(timeout=timeout)
+        except TimeoutError:
+            # 저장이 늦어지고 있을 뿐 나중에 디스크에 들어갈 수 있다. 캐시를 버려 디스크에서 다시 읽게 하고,
+            # 그 사이에 다시 만들어진 캐시도 저장이 끝나면 한 번 더 버린다.
+            self.invalidate(name)
+            future.add_done_callback(lambda _: self.invalidate(name))
+            raise
+        self._written(name,entry,rollup,history)
+        return entry
+
+    def save_data(self,name,df):
+        self.store.for_user(name).save(df)
+        self.invalidate(name)
+
+    @timed("emotion.export_csv")
+    def export_csv(self,name,out):
+        # 사용자 파일을 청크 단위로 읽어 out(바이너리 파일)에 CSV 로 쓴다
+        export_storage(self.store.for_user(name),out)
+
+    @timed("emotion.import_csv")
+    def import_csv(self,name,src):
+        result = import_csv(src,self.store.for_user(name))
+        self.invalidate(name)
+        return result
@@ -0,0 +1,128 @@
+# emotion_report.py
+# 📄 주간 PDF 리포트
+# - 요약 문구 / PDF 생성 (fpdf 는 실제로 PDF 를 만들 때 불러온다)
+# - 한글을 쓰려면 유니코드 TTF 글꼴이 필요하다: REPORT_FONT 환경 변수 > 흔한 한글 글꼴 경로 >
+#   matplotlib 에 들어 있는 DejaVuSans (한글 글리프는 없어서 빈칸으로 나오지만 PDF 는 만들어진다)
+# - ReportService: 요청이 있을 때만 작업 풀에서 생성하고
+#   (사용자, 주 시작일) 별로 데이터 버전이 같으면 결과를 재사용한다
+
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from emotion_charts import create_week_plot,create_calendar_plot
+from emotion_core import EMO_LABELS,FEEDBACK
+from perf import timed
+
+# ----------------------
+# 설정
+# ----------------------
+FONT_FAMILY = "Report"
+FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "C:/Windows/Fonts/malgun.ttf",
+    "/System/Library/Fonts/Supplemental/AppleGothic.ttf",
+    "/Library/Fonts/NanumGothic.ttf",
+]
+
+def report_font():
+    # 한글 글꼴 경로 (없으면 matplotlib 의 DejaVuSans)
+    env = os.environ.get("REPORT_FONT")
+    if env and os.path.exists(env):
+        return env
+    for path in FONT_CANDIDATES:
+        if os.path.exists(path):
+            return path
+    import matplotlib
+    return os.path.join(matplotlib.get_data_path(),"fonts","ttf","DejaVuSans.ttf")
+
+# ----------------------
+# 리포트 내용
+# ----------------------
+def weekly_summary(name,start,end,counts):
+    avg_emotion = counts.idxmax() if counts.sum()>0 else None
+    summary_lines = [f"사용자: {name}",
+                     f"주간 ({start} ~ {end}) 요약:",
+                     f"- 총 기록 수: {int(counts.sum())}",
+                     f"- 가장 많이 기록된 감정: {EMO_LABELS[avg_emotion] if avg_emotion else '기록 없음'}","",
+                     "추천 활동:"]
+    if avg_emotion:
+        summary_lines.append(f"- {FEEDBACK[avg_emotion][0]}: {FEEDBACK[avg_emotion][1]}")
+    return "\n".join(summary_lines)
+
+@timed("report.pdf_build")
+def generate_pdf_report(summary_text,week_buf,calendar_buf,filename="weekly_report.pdf"):
+    from fpdf import FPDF  # PDF 를 만들 때만 불러온다
+    pdf = FPDF()
+    font = report_font()
+    # 기본 Arial(코어 글꼴)은 latin-1 만 되어 한글에서 예외가 난다
+    pdf.add_font(FONT_FAMILY,"",font)
+    pdf.add_font(FONT_FAMILY,"B",font)
+    pdf.add_page()
+    pdf.set_font(FONT_FAMILY,"B",16)
+    pdf.cell(0,10,"주간 감정 리포트",new_x="LMARGIN",new_y="NEXT",align="C")
+    pdf.ln(4)
+    pdf.set_font(FONT_FAMILY,size=12)
+    for line in summary_text.split("\n"):
+        pdf.multi_cell(0,6,line,new_x="LMARGIN",new_y="NEXT")
+    pdf.ln(4)
+    pdf.set_font(FONT_FAMILY,"B",12)
+    pdf.cell(0,6,"이번 주 감정 분포",new_x="LMARGIN",new_y="NEXT")
+    pdf.image(week_buf,x=15,w=180)
+    pdf.ln(4)
+    pdf.cell(0,6,"주간 감정 캘린더",new_x="LMARGIN",new_y="NEXT")
+    pdf.image(calendar_buf,x=15,w=180)
+    out = io.BytesIO()
+    pdf.output(out)
+    out.seek(0)
+    return out
+
+@timed("report.render")
+def render_weekly_report(name,start,end,counts,day_emotion):
+    summary_text = weekly_summary(name,start,end,counts)
+    out = generate_pdf_report(summary_text,create_week_plot(counts),create_calendar_plot(day_emotion))
+    return out.getvalue()
+
+def report_version(counts,day_emotion):
+    # 그 주에 기록이 추가되면 집계가 반드시 바뀌므로 집계 자체를 버전으로 쓴다
+    return (tuple(int(n) for n in counts.values),tuple(day_emotion.values()))
+
+# ----------------------
+# 백그라운드 생성 + 캐시
+# ----------------------
+class ReportService:
+    def __init__(self,max_workers=2,max_reports=256):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,thread_name_prefix="report")
+        self._jobs = OrderedDict()  # (user, week_start) -> (version, Future)
+        self._lock = threading.Lock()
+        self.max_reports = max_reports
+
+    def get(self,user,start,version):
+        with self._lock:
+            job = self._jobs.get((user,start))
+            if job is None or job[0]!=version:
+                return None
+            future = job[1]
+            if future.done() and future.exception() is not None:
+                # 실패한 작업은 다시 요청할 수 있도록 버린다
+                del self._jobs[(user,start)]
+                return future
+            self._jobs.move_to_end((user,start))
+            return future
+
+    def submit(self,user,start,end,counts,day_emotion):
+        version = report_version(counts,day_emotion)
+        with self._lock:
+            job = self._jobs.get((user,start))
+            if job is not None and job[0]==version:
+                return job[1]
+            future = self._pool.submit(render_weekly_report,user,start,end,counts,day_emotion)
+            self._jobs[(user,start)] = (version,future)
+            self._jobs.move_to_end((user,start))
+            while len(self._jobs)>self.max_reports:
+                self._jobs.popitem(last=False)
+            return future
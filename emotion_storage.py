@@ -0,0 +1,721 @@
+# emotion_storage.py
+# 💾 감정 기록 저장소
+# - CsvStorage: 기존 방식 (매번 전체 파일 재작성)
+# - AppendLogStorage: 추가 전용 CSV 로그 (기록 1건 추가 = O(1), 주기적 압축)
+# - SqliteStorage: SQLite WAL 모드 (주기적 체크포인트)
+# - ColumnarStorage: Feather/Parquet 스냅샷 + 추가 전용 로그 (압축 시 스냅샷에 합침)
+# 모든 저장소가 load / load_compact / load_days / iter_chunks / save / append / append_many / compact 를 제공한다.
+# load 는 CSV 와 같은 모양(timestamp,date,time,emotion,note), load_compact 는 분석용
+# 압축 표현(timestamp datetime64 + emotion 카테고리 코드, 메모 제외)을, load_days 는 며칠 치 행만 돌려준다.
+# CSV -> Feather 변환: get_storage("emotions.feather").save(CsvStorage("emotions.csv").load())
+# PartitionedStorage 는 사용자별로 파일을 나누고 파일 잠금으로 감싼다.
+# WriteQueue 는 여러 세션의 기록을 모아 사용자별로 한 번에 저장한다 (group commit, 사용자끼리는 동시에).
+# iter_csv_chunks / export_storage / import_csv 는 CSV 내보내기(청크 단위)와 대량 가져오기를 맡는다.
+
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future,ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from datetime import datetime,timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 내 잠금만 사용
+    fcntl = None
+
+import pandas as pd
+
+from emotion_core import EMOTIONS
+
+COLUMNS = ["timestamp","date","time","emotion","note"]
+EMOTION_DTYPE = pd.CategoricalDtype(EMOTIONS)
+UNKNOWN_CODE = 255  # 스냅샷(uint8)에서 EMOTIONS 에 없는 감정
+TS_FORMAT = "%Y-%m-%d %H:%M:%S.%f"  # CSV 에 쓰는 timestamp 형식 (한 파일 안에서 섞이지 않게)
+ROW_START = re.compile(rb"\n\d{4}-\d\d-\d\d[ T]")  # CSV 한 행의 시작 (줄 맨 앞의 timestamp)
+
+# ----------------------
+# 공통 유틸
+# ----------------------
+def make_entry(emotion,note,when=None):
+    now = when if when else datetime.now()
+    return {"timestamp":now,"date":now.date().isoformat(),"time":now.time().strftime("%H:%M:%S"),"emotion":emotion,"note":note}
+
+def empty_frame():
+    return pd.DataFrame(columns=COLUMNS)
+
+def to_compact(df):
+    # 감정은 1바이트 카테고리 코드, 시간은 datetime64 한 열만 남긴다
+    return pd.DataFrame({"timestamp":pd.to_datetime(df["timestamp"]),
+                         "emotion":df["emotion"].astype(EMOTION_DTYPE)})
+
+def _cell(value):
+    if isinstance(value,datetime):
+        return value.strftime(TS_FORMAT)
+    return "" if value is None else value
+
+def _row(entry):
+    return [_cell(entry.get(c)) for c in COLUMNS]
+
+def _fsync(f):
+    f.flush()
+    os.fsync(f.fileno())
+
+class _Prefix(io.RawIOBase):
+    # 열린 파일의 앞 size 바이트만 읽게 한다 (연 뒤에 덧붙은 줄은 보지 않는다)
+    def __init__(self,f,size):
+        self.f,self.left = f,size
+
+    def readable(self):
+        return True
+
+    def readinto(self,b):
+        n = self.f.readinto(memoryview(b)[:self.left]) if self.left>0 else 0
+        self.left -= n
+        return n
+
+def _csv_chunks(f,size,chunksize):
+    with f:
+        yield from pd.read_csv(io.BufferedReader(_Prefix(f,size)),encoding="utf-8",chunksize=chunksize,
+                               dtype=str,keep_default_na=False,on_bad_lines="skip")
+
+def _sql_chunks(con,cur,chunksize):
+    with closing(con):
+        columns = [c[0] for c in cur.description]
+        while True:
+            rows = cur.fetchmany(chunksize)
+            if not rows:
+                return
+            yield pd.DataFrame(rows,columns=columns)
+
+# ----------------------
+# CSV (전체 재작성)
+# ----------------------
+class CsvStorage:
+    def __init__(self,path):
+        self.path = path
+
+    def load(self):
+        if os.path.exists(self.path) and os.path.getsize(self.path)>0:
+            return pd.read_csv(self.path,parse_dates=["timestamp"])
+        return empty_frame()
+
+    def load_compact(self):
+        if os.path.exists(self.path) and os.path.getsize(self.path)>0:
+            return pd.read_csv(self.path,usecols=["timestamp","emotion"],parse_dates=["timestamp"],
+                               dtype={"emotion":EMOTION_DTYPE},on_bad_lines="skip")
+        return to_compact(empty_frame())
+
+    def iter_chunks(self,chunksize=50000):
+        # 파일 전체를 DataFrame 으로 만들지 않고 chunksize 행씩 (쓰인 문자열 그대로) 읽는다.
+        # 파일은 지금 열고 지금 길이까지만 읽는다: 저장/압축은 os.replace 로 새 파일을 만들고
+        # 추가는 그 뒤에만 붙으므로, 잠금을 놓은 뒤 천천히 읽어도 연 시점의 내용 그대로다
+        if not (os.path.exists(self.path) and os.path.getsize(self.path)>0):
+            return iter(())
+        f = open(self.path,"rb")
+        return _csv_chunks(f,os.fstat(f.fileno()).st_size,chunksize)
+
+    def load_days(self,start,end,expected=None):
+        # start~end 날짜(포함)의 행만 남긴다 (date 열 문자열로 거른다).
+        # expected(그 기간의 행 수)를 알면 파일 끝에서부터 읽는 범위를 4배씩 늘리다 그만큼 찾으면 멈춘다
+        # (기록은 거의 시간순으로 뒤에 붙으므로 최근 페이지는 끝부분만 읽는다). 못 찾으면 파일 전체를 훑는다
+        first,last = start.isoformat(),end.isoformat()
+        if expected and os.path.exists(self.path):
+            size,block = os.path.getsize(self.path),1<<16
+            while block<size:
+                tail = self._tail(size-block,size)
+                if tail is not None:
+                    rows = tail[(tail["date"]>=first)&(tail["date"]<=last)]
+                    if len(rows)>=expected:
+                        return rows.reset_index(drop=True)
+                block *= 4
+        rows = [c[(c["date"]>=first)&(c["date"]<=last)] for c in self.iter_chunks(100000)]
+        return pd.concat(rows,ignore_index=True) if rows else empty_frame()
+
+    def _tail(self,offset,size):
+        # offset 뒤 첫 행 시작(줄 맨 앞이 날짜)부터 size 까지를 읽는다 (행 시작을 못 찾으면 None)
+        with open(self.path,"rb") as f:
+            header = f.readline()
+            f.seek(offset)
+            data = f.read(size-offset)
+        m = ROW_START.search(data)
+        if m is None:
+            return None
+        return pd.read_csv(io.BytesIO(header+data[m.start()+1:]),encoding="utf-8",dtype=str,
+                           keep_default_na=False,on_bad_lines="skip")
+
+    def save(self,df):
+        # 임시 파일에 쓰고 교체해서 저장 도중 종료돼도 기존 파일이 깨지지 않게 한다
+        tmp = self.path+".tmp"
+        with open(tmp,"w",newline="",encoding="utf-8") as f:
+            df.to_csv(f,index=False,date_format=TS_FORMAT)
+            _fsync(f)
+        os.replace(tmp,self.path)
+
+    def append_many(self,entries):
+        if not entries:
+            return
+        df = pd.concat([self.load(),pd.DataFrame(entries)],ignore_index=True)
+        self.save(df)
+
+    def append(self,entry):
+        self.append_many([entry])
+
+    def append_frame(self,frame):
+        if len(frame):
+            self.save(pd.concat([self.load(),frame[COLUMNS]],ignore_index=True))
+
+    def compact(self):
+        pass
+
+# ----------------------
+# 추가 전용 CSV 로그
+# ----------------------
+class AppendLogStorage(CsvStorage):
+    # 기존 emotions.csv 와 같은 형식이라 그대로 이어서 쓸 수 있다.
+    # compact_every 건마다 시간순으로 정렬해 원자적으로 다시 쓴다.
+    # append_frame(대량 추가)은 주기에 세지 않는다 (import_csv 가 끝난 뒤 한 번 compact)
+    def __init__(self,path,compact_every=5000):
+        super().__init__(path)
+        self.compact_every = compact_every
+        self._appends = 0
+
+    def load(self):
+        if os.path.exists(self.path) and os.path.getsize(self.path)>0:
+            return pd.read_csv(self.path,parse_dates=["timestamp"],on_bad_lines="skip")
+        return empty_frame()
+
+    @contextmanager
+    def _appending(self):
+        # (파일, 새 파일 여부)를 넘겨주고, 다 쓰면 fsync 한다
+        new = not os.path.exists(self.path) or os.path.getsize(self.path)==0
+        if not new:
+            self._repair_tail()
+        with open(self.path,"a",newline="",encoding="utf-8") as f:
+            yield f,new
+            _fsync(f)
+
+    def append_many(self,entries):
+        if not entries:
+            return
+        with self._appending() as (f,new):
+            w = csv.writer(f)
+            if new:
+                w.writerow(COLUMNS)
+            w.writerows(_row(e) for e in entries)
+        self._appends += len(entries)
+        if self.compact_every and self._appends>=self.compact_every:
+            self.compact()
+
+    def append_frame(self,frame):
+        if not len(frame):
+            return
+        with self._appending() as (f,new):
+            frame[COLUMNS].to_csv(f,header=new,index=False,date_format=TS_FORMAT)
+
+    def _repair_tail(self):
+        # 쓰다가 죽어서 잘린 마지막 줄이 있으면 마지막 개행 뒤를 잘라낸다
+        with open(self.path,"rb+") as f:
+            f.seek(0,os.SEEK_END)
+            size = f.tell()
+            f.seek(size-1)
+            if f.read(1)==b"\n":
+                return
+            pos = size
+            while pos>0:
+                step = min(4096,pos)
+                pos -= step
+                f.seek(pos)
+                block = f.read(step)
+                nl = block.rfind(b"\n")
+                if nl>=0:
+                    f.truncate(pos+nl+1)
+                    return
+            f.truncate(0)
+
+    def compact(self):
+        df = self.load()
+        if not df.empty:
+            df = df.sort_values("timestamp",kind="stable")
+        self.save(df)
+        self._appends = 0
+
+# ----------------------
+# SQLite (WAL)
+# ----------------------
+class SqliteStorage:
+    def __init__(self,path,checkpoint_every=1000):
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        self._appends = 0
+        with closing(self._connect()) as con, con:
+            con.execute("CREATE TABLE IF NOT EXISTS entries ("
+                        "id INTEGER PRIMARY KEY, timestamp TEXT, date TEXT, time TEXT, emotion TEXT, note TEXT)")
+            con.execute("CREATE INDEX IF NOT EXISTS entries_timestamp ON entries(timestamp)")
+
+    def _connect(self):
+        con = sqlite3.connect(self.path,timeout=30)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        return con
+
+    def load(self):
+        with closing(self._connect()) as con:
+            df = pd.read_sql_query("SELECT timestamp,date,time,emotion,note FROM entries ORDER BY id",con)
+        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        return df
+
+    def load_compact(self):
+        with closing(self._connect()) as con:
+            df = pd.read_sql_query("SELECT timestamp,emotion FROM entries ORDER BY id",con)
+        return to_compact(df)
+
+    def load_days(self,start,end,expected=None):
+        # timestamp 는 TS_FORMAT 문자열이라 사전순 비교 = 시간순 비교 (entries_timestamp 인덱스 사용)
+        with closing(self._connect()) as con:
+            return pd.read_sql_query("SELECT timestamp,date,time,emotion,note FROM entries "
+                                     "WHERE timestamp>=? AND timestamp<? ORDER BY id",con,
+                                     params=(start.isoformat(),(end+timedelta(days=1)).isoformat()))
+
+    def iter_chunks(self,chunksize=50000):
+        # execute 가 첫 행을 읽는 순간의 스냅샷을 끝까지 읽는다 (WAL: 그동안의 쓰기를 막지 않음)
+        con = self._connect()
+        cur = con.execute("SELECT timestamp,date,time,emotion,note FROM entries ORDER BY id")
+        return _sql_chunks(con,cur,chunksize)
+
+    def save(self,df):
+        rows = [_row(r) for r in df.to_dict("records")]
+        with closing(self._connect()) as con, con:
+            con.execute("DELETE FROM entries")
+            con.executemany("INSERT INTO entries (timestamp,date,time,emotion,note) VALUES (?,?,?,?,?)",rows)
+
+    def append_many(self,entries):
+        if not entries:
+            return
+        with closing(self._connect()) as con, con:
+            con.executemany("INSERT INTO entries (timestamp,date,time,emotion,note) VALUES (?,?,?,?,?)",
+                            [_row(e) for e in entries])
+        self._appends += len(entries)
+        if self.checkpoint_every and self._appends>=self.checkpoint_every:
+            self.compact()
+
+    def append(self,entry):
+        self.append_many([entry])
+
+    def append_frame(self,frame):
+        self.append_many(frame[COLUMNS].to_dict("records"))
+
+    def compact(self):
+        # PASSIVE: 읽는 중인 내보내기를 기다리지 않고 지금 옮길 수 있는 만큼만 옮긴다
+        with closing(self._connect()) as con:
+            con.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        self._appends = 0
+
+# ----------------------
+# Feather/Parquet 스냅샷 + 추가 로그
+# ----------------------
+class ColumnarStorage:
+    # 스냅샷은 timestamp(datetime64) / emotion(uint8 코드) / note 세 열.
+    # 새 기록은 path+".log.csv" 에 추가하고 compact_every 건마다 스냅샷에 합친다
+    # (append_frame 대량 추가는 세지 않는다, import_csv 가 끝난 뒤 한 번 compact).
+    # Feather/Parquet 읽기·쓰기에는 pyarrow 가 필요하다.
+    # 저장(save/compact) 순서: 새 스냅샷을 .tmp 에 다 쓴다 -> 로그를 .old 로 옮긴다 -> .tmp 로 스냅샷 교체
+    # -> .old 삭제. 중간에 죽어도 .old 와 .tmp 가 둘 다 있으면 .tmp 가, 아니면 스냅샷이 현재 내용이라
+    # 로그의 행이 두 번 읽히거나 빠지지 않는다 (다음 쓰기 때 _recover 가 마저 끝낸다).
+    def __init__(self,path,compact_every=5000):
+        self.path = path
+        self.tmp = path+".tmp"
+        self.log = AppendLogStorage(path+".log.csv",compact_every=0)
+        self.merged = self.log.path+".old"
+        self.compact_every = compact_every
+        self._appends = 0
+
+    def _snapshot_path(self):
+        if os.path.exists(self.merged) and os.path.exists(self.tmp):
+            return self.tmp
+        return self.path
+
+    def _recover(self):
+        # 지난 저장이 로그를 옮긴 뒤 멈췄으면 마저 끝낸다 (쓰기 잠금 안에서만 부른다)
+        if os.path.exists(self.merged):
+            if os.path.exists(self.tmp):
+                os.replace(self.tmp,self.path)
+            os.remove(self.merged)
+
+    def _read_snapshot(self,columns=None,src=None):
+        # src: 이미 열어 둔 스냅샷 파일 (없으면 현재 스냅샷 경로)
+        if src is None:
+            src = self._snapshot_path()
+            if not os.path.exists(src):
+                return None
+        if self.path.endswith(".parquet"):
+            return pd.read_parquet(src,columns=columns)
+        return pd.read_feather(src,columns=columns)
+
+    def _write_snapshot(self,snap):
+        if self.path.endswith(".parquet"):
+            snap.to_parquet(self.tmp,index=False)
+        else:
+            snap.to_feather(self.tmp)
+        if os.path.exists(self.log.path):
+            os.replace(self.log.path,self.merged)
+        os.replace(self.tmp,self.path)
+        if os.path.exists(self.merged):
+            os.remove(self.merged)
+
+    @staticmethod
+    def _decode(snap):
+        codes = snap["emotion"].to_numpy().astype("int16")
+        codes[codes==UNKNOWN_CODE] = -1
+        return pd.Categorical.from_codes(codes,dtype=EMOTION_DTYPE)
+
+    def load_compact(self):
+        tail = self.log.load_compact()
+        snap = self._read_snapshot(["timestamp","emotion"])
+        if snap is None:
+            return tail
+        head = pd.DataFrame({"timestamp":snap["timestamp"],"emotion":self._decode(snap)})
+        return pd.concat([head,tail],ignore_index=True) if len(tail) else head
+
+    def _expand(self,snap):
+        # 스냅샷 행 -> CSV 와 같은 모양
+        ts = snap["timestamp"]
+        return pd.DataFrame({"timestamp":ts,
+                             "date":ts.dt.strftime("%Y-%m-%d"),
+                             "time":ts.dt.strftime("%H:%M:%S"),
+                             "emotion":self._decode(snap).astype(object),
+                             "note":snap["note"]})
+
+    def load(self):
+        tail = self.log.load()
+        snap = self._read_snapshot()
+        if snap is None:
+            return tail
+        head = self._expand(snap)
+        return pd.concat([head,tail],ignore_index=True) if len(tail) else head
+
+    def load_days(self,start,end,expected=None):
+        # 스냅샷은 timestamp 열로 고른 행만 풀어 쓴다 (메모 열은 읽는 동안만 메모리에 올라간다)
+        tail = self.log.load_days(start,end)
+        snap = self._read_snapshot(["timestamp"])
+        if snap is None:
+            return tail
+        ts = snap["timestamp"]
+        hit = ((ts>=pd.Timestamp(start))&(ts<pd.Timestamp(end+timedelta(days=1)))).to_numpy()
+        if not hit.any():
+            return tail
+        head = self._expand(self._read_snapshot()[hit])
+        return pd.concat([head,tail],ignore_index=True) if len(tail) else head
+
+    def iter_chunks(self,chunksize=50000):
+        # 스냅샷과 로그를 지금 열어 두고(교체는 os.replace 라 연 파일은 그대로) 읽기는 나중에 한다
+        path = self._snapshot_path()
+        snap = open(path,"rb") if os.path.exists(path) else None
+        return self._chunks(snap,self.log.iter_chunks(chunksize),chunksize)
+
+    def _chunks(self,f,tail,chunksize):
+        # 압축된 스냅샷은 한 번에 읽고 chunksize 행씩 풀어서 내보낸 뒤 로그를 청크로 읽는다
+        if f is not None:
+            with f:
+                snap = self._read_snapshot(src=f)
+            for i in range(0,len(snap),chunksize):
+                yield self._expand(snap.iloc[i:i+chunksize])
+        yield from tail
+
+    def save(self,df):
+        # 스냅샷 하나로 다시 쓰고 로그는 비운다 (순서는 클래스 설명 참고)
+        self._recover()
+        compact = to_compact(df)
+        codes = compact["emotion"].cat.codes.to_numpy().astype("int16")
+        codes[codes<0] = UNKNOWN_CODE
+        note = df["note"] if "note" in df else pd.Series("",index=df.index)
+        self._write_snapshot(pd.DataFrame({"timestamp":compact["timestamp"].to_numpy(),
+                                           "emotion":codes.astype("uint8"),
+                                           "note":note.fillna("").astype(str).to_numpy()}))
+
+    def append_many(self,entries):
+        if not entries:
+            return
+        self._recover()
+        self.log.append_many(entries)
+        self._logged(len(entries))
+
+    def append_frame(self,frame):
+        self._recover()
+        self.log.append_frame(frame)
+
+    def _logged(self,count):
+        self._appends += count
+        if self.compact_every and self._appends>=self.compact_every:
+            self.compact()
+
+    def append(self,entry):
+        self.append_many([entry])
+
+    def compact(self):
+        self.save(self.load())
+        self._appends = 0
+
+# ----------------------
+# 저장소 선택
+# ----------------------
+def get_storage(path):
+    # 확장자로 저장소를 고른다: .db/.sqlite -> SQLite, .feather/.parquet -> 열 기반 스냅샷,
+    # 그 외 -> 추가 전용 CSV 로그
+    if path.endswith((".db",".sqlite",".sqlite3")):
+        return SqliteStorage(path)
+    if path.endswith((".feather",".parquet")):
+        return ColumnarStorage(path)
+    return AppendLogStorage(path)
+
+# ----------------------
+# 사용자별 분할 저장소
+# ----------------------
+@contextmanager
+def file_lock(path,shared=False):
+    # path+".lock" 파일에 flock 을 건다 (읽기는 공유, 쓰기는 배타)
+    with open(path+".lock","a") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(),fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(),fcntl.LOCK_UN)
+
+class LockedStorage:
+    # 저장소 하나를 파일 잠금으로 감싼다. 같은 파일에 쓰는 프로세스/스레드끼리만 기다린다.
+    # on_write 는 첫 쓰기 후 한 번 호출된다 (사용자 목록 등록).
+    def __init__(self,storage,on_write=None):
+        self.storage = storage
+        self.path = storage.path
+        self.on_write = on_write
+        self._lock = threading.Lock()
+
+    def _written(self):
+        if self.on_write:
+            on_write,self.on_write = self.on_write,None
+            on_write()
+
+    def load(self):
+        with file_lock(self.path,shared=True):
+            return self.storage.load()
+
+    def load_compact(self):
+        with file_lock(self.path,shared=True):
+            return self.storage.load_compact()
+
+    def load_days(self,start,end,expected=None):
+        with file_lock(self.path,shared=True):
+            return self.storage.load_days(start,end,expected)
+
+    def iter_chunks(self,chunksize=50000):
+        # 공유 잠금은 읽을 파일을 여는 동안만 잡는다 (긴 내보내기가 쓰기를 막지 않게)
+        with file_lock(self.path,shared=True):
+            return self.storage.iter_chunks(chunksize)
+
+    def save(self,df):
+        with self._lock, file_lock(self.path):
+            self.storage.save(df)
+        self._written()
+
+    def append_many(self,entries):
+        with self._lock, file_lock(self.path):
+            self.storage.append_many(entries)
+        self._written()
+
+    def append(self,entry):
+        self.append_many([entry])
+
+    def append_frame(self,frame):
+        with self._lock, file_lock(self.path):
+            self.storage.append_frame(frame)
+        self._written()
+
+    def compact(self):
+        with self._lock, file_lock(self.path):
+            self.storage.compact()
+
+def user_key(name):
+    # 파일 이름으로 쓸 수 있는 사용자 키 (이름이 비슷해도 겹치지 않게 해시를 붙인다)
+    name = name.strip() or "default"
+    safe = re.sub(r"[^\w-]","_",name)[:40]
+    return f"{safe}-{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}"
+
+class PartitionedStorage:
+    # root/<user_key>.<ext> 에 사용자별로 저장하고 root/users.json 에 사용자 목록을 둔다.
+    # 세션은 자기 사용자 파일만 읽고 쓰므로 서로 다른 사용자의 저장은 서로를 막지 않는다.
+    def __init__(self,root,ext=".csv"):
+        self.root = root
+        self.ext = ext
+        self.index_path = os.path.join(root,"users.json")
+        self._parts = {}
+        self._lock = threading.Lock()
+        os.makedirs(root,exist_ok=True)
+
+    def users(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        with file_lock(self.index_path,shared=True), open(self.index_path,encoding="utf-8") as f:
+            return json.load(f)
+
+    def _register(self,key,name):
+        with file_lock(self.index_path):
+            users = {}
+            if os.path.exists(self.index_path):
+                with open(self.index_path,encoding="utf-8") as f:
+                    users = json.load(f)
+            if users.get(key)==name:
+                return
+            users[key] = name
+            tmp = self.index_path+".tmp"
+            with open(tmp,"w",encoding="utf-8") as f:
+                json.dump(users,f,ensure_ascii=False,indent=1)
+                _fsync(f)
+            os.replace(tmp,self.index_path)
+
+    def for_user(self,name):
+        key = user_key(name)
+        with self._lock:
+            part = self._parts.get(key)
+            if part is None:
+                part = LockedStorage(get_storage(os.path.join(self.root,key+self.ext)),
+                                     on_write=lambda: self._register(key,name))
+                self._parts[key] = part
+        return part
+
+    def migrate_legacy(self,path,default_name,chunksize=100000):
+        # 예전 단일 파일(emotions.csv)을 한 번만 사용자별 파일로 옮긴다.
+        # name 열이 있으면 그 이름별로 나누고(빈 값은 default_name), 없으면 모두 default_name 에게 준다.
+        # 다 옮기면 원본은 지우지 않고 path+".migrated" 로 이름만 바꾼다. (옮긴 행 수, 버린 행 수)
+        if not os.path.exists(path):
+            return 0,0
+        imported = rejected = 0
+        touched = set()
+        with file_lock(path):
+            if not os.path.exists(path):  # 다른 프로세스가 먼저 옮겼다
+                return 0,0
+            if os.path.getsize(path)>0:
+                for chunk in pd.read_csv(path,chunksize=chunksize,dtype=str,keep_default_na=False,na_values=[""]):
+                    if "name" in chunk:
+                        names = chunk["name"].fillna("").str.strip().replace("",default_name)
+                    else:
+                        names = pd.Series(default_name,index=chunk.index)
+                    for name,part in chunk.groupby(names,sort=False):
+                        frame,bad = _clean_chunk(part)
+                        self.for_user(name).append_frame(frame)
+                        touched.add(name)
+                        imported += len(frame)
+                        rejected += bad
+            for name in touched:  # 대량 추가는 압축 주기에 세지 않으니 사용자마다 한 번씩 정리
+                self.for_user(name).compact()
+            os.replace(path,path+".migrated")
+        return imported,rejected
+
+# ----------------------
+# 묶음 저장 큐 (group commit)
+# ----------------------
+class WriteQueue:
+    # submit() 은 Future 를 돌려주고, flush_interval 초 동안 쌓인 기록을 사용자별 append_many 한 번으로
+    # 저장(fsync)한 뒤 Future 를 완료한다. Future.result() 가 돌아오면 디스크에 기록된 것이다.
+    # 사용자마다 따로 줄을 세워 스레드 풀에서 저장한다: 같은 사용자의 기록은 순서대로 한 번에 하나씩,
+    # 다른 사용자끼리는 동시에 쓰므로 한 사용자 파일의 잠금/압축이 다른 사용자의 저장을 기다리게 하지 않는다.
+    # (동시에 느린 사용자가 max_workers 명을 넘으면 그다음 사용자부터 기다린다)
+    def __init__(self,store,flush_interval=0.005,max_batch=1000,max_workers=8):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending = {}  # name -> [(entry, future)], 키가 있으면 그 사용자 줄이 돌고 있다
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,thread_name_prefix="emotion-writer")
+
+    def submit(self,name,entry):
+        future = Future()
+        with self._lock:
+            lane = self._pending.get(name)
+            start = lane is None
+            if start:
+                lane = self._pending[name] = []
+            lane.append((entry,future))
+        if start:
+            self._pool.submit(self._flush,name)
+        return future
+
+    def _flush(self,name):
+        # 이 사용자 줄에 쌓인 기록을 다 쓸 때까지 max_batch 건씩 저장한다
+        time.sleep(self.flush_interval)
+        while True:
+            with self._lock:
+                lane = self._pending[name]
+                items = lane[:self.max_batch]
+                del lane[:self.max_batch]
+                if not items:
+                    del self._pending[name]
+                    return
+            try:
+                self.store.for_user(name).append_many([e for e,_ in items])
+            except Exception as exc:
+                for _,future in items:
+                    future.set_exception(exc)
+            else:
+                for _,future in items:
+                    future.set_result(True)
+
+# ----------------------
+# CSV 내보내기 / 대량 가져오기
+# ----------------------
+def iter_csv_chunks(df,chunksize=50000):
+    # 전체를 한 문자열로 만들지 않고 chunksize 행씩 UTF-8 바이트로 흘려보낸다
+    yield df.iloc[:0].to_csv(index=False).encode("utf-8")
+    for i in range(0,len(df),chunksize):
+        yield df.iloc[i:i+chunksize].to_csv(index=False,header=False,date_format=TS_FORMAT).encode("utf-8")
+
+def export_csv(df,out,chunksize=50000):
+    for chunk in iter_csv_chunks(df,chunksize):
+        out.write(chunk)
+
+def export_storage(storage,out,chunksize=50000):
+    # 저장소를 chunksize 행씩 읽어 바로 CSV 바이트로 쓴다 (전체 기록을 DataFrame 으로 만들지 않음)
+    out.write(empty_frame().to_csv(index=False).encode("utf-8"))
+    for chunk in storage.iter_chunks(chunksize):
+        out.write(chunk[COLUMNS].to_csv(index=False,header=False,date_format=TS_FORMAT).encode("utf-8"))
+
+def _clean_chunk(chunk):
+    # 감정이 EMOTIONS 에 있고 시간이 읽히는 행만 남기고 date/time 은 timestamp 에서 다시 만든다
+    if "timestamp" in chunk:
+        ts = pd.to_datetime(chunk["timestamp"],errors="coerce",format="mixed")
+    else:
+        ts = pd.to_datetime(chunk["date"].astype(str)+" "+chunk.get("time",pd.Series("00:00:00",index=chunk.index)).astype(str),
+                            errors="coerce",format="mixed")
+    emotion = chunk["emotion"].astype(str).str.strip()
+    ok = ts.notna() & emotion.isin(EMOTIONS)
+    ts = ts[ok]
+    note = chunk["note"][ok] if "note" in chunk else pd.Series("",index=ts.index)
+    frame = pd.DataFrame({"timestamp":ts,
+                          "date":ts.dt.strftime("%Y-%m-%d"),
+                          "time":ts.dt.strftime("%H:%M:%S"),
+                          "emotion":emotion[ok],
+                          "note":note.fillna("").astype(str)})
+    return frame,int((~ok).sum())
+
+def import_csv(src,storage,chunksize=100000):
+    # src(경로/파일 객체)를 chunksize 행씩 한 번만 읽어 storage 에 통째로 추가하고,
+    # 다 넣은 뒤 한 번만 compact 한다 (청크마다 전체 파일을 다시 쓰지 않게).
+    # (가져온 행 수, 버린 행 수)를 돌려준다
+    imported = rejected = 0
+    for chunk in pd.read_csv(src,chunksize=chunksize,dtype=str,keep_default_na=False,na_values=[""]):
+        if "emotion" not in chunk or ("timestamp" not in chunk and "date" not in chunk):
+            raise ValueError("CSV 에 emotion 과 timestamp(또는 date) 열이 필요합니다.")
+        frame,bad = _clean_chunk(chunk)
+        storage.append_frame(frame)
+        imported += len(frame)
+        rejected += bad
+    if imported:
+        storage.compact()
+    return imported,rejected
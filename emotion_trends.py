@@ -0,0 +1,76 @@
+# emotion_trends.py
+# 📈 장기 감정 추세
+# - 7/30일 이동 평균 기분 점수 (SCORE_MAP, 캘린더 그래프와 같은 점수)
+# - 월별 감정 분포
+# - 연속 기록 / 연속 긍정 일수
+# 원본 기록 대신 DailyRollup 의 일별 집계(날짜 수만큼의 행)에서 계산하고,
+# 이동 평균 같은 중간 결과는 엔진 안에 캐시한다.
+
+import numpy as np
+import pandas as pd
+
+from emotion_core import EMOTIONS,SCORE_MAP
+from perf import timed
+
+SCORE_VECTOR = np.array([SCORE_MAP[e] for e in EMOTIONS],dtype=float)
+POSITIVE_SCORE = SCORE_MAP["happy"]
+
+def _runs(mask):
+    # True 가 이어지는 구간의 (최장 길이, 마지막 날까지 이어진 길이)
+    m = np.asarray(mask,dtype=np.int8)
+    if not m.any():
+        return 0,0
+    edges = np.flatnonzero(np.diff(np.r_[0,m,0]))
+    lengths = edges[1::2]-edges[::2]
+    return int(lengths.max()),int(lengths[-1]) if m[-1] else 0
+
+def _span(start,end):
+    return slice(None if start is None else pd.Timestamp(start),None if end is None else pd.Timestamp(end))
+
+class TrendEngine:
+    def __init__(self,daily):
+        # daily: 날짜(DatetimeIndex) x EMOTIONS 기록 수. 빈 날은 0으로 채운다
+        if len(daily):
+            daily = daily.sort_index().asfreq("D",fill_value=0)
+        self.daily = daily.astype("int64")
+        self.count = self.daily.sum(axis=1)
+        self.score_sum = pd.Series(self.daily.to_numpy()@SCORE_VECTOR,index=self.daily.index)
+        self.score = self.score_sum/self.count.where(self.count>0)
+        self._rolling = {}
+
+    @classmethod
+    @timed("emotion.trends_build")
+    def from_rollup(cls,rollup):
+        daily = pd.DataFrame.from_dict(rollup.daily_counts(),orient="index")
+        daily = daily.reindex(columns=EMOTIONS,fill_value=0).fillna(0)
+        daily.index = pd.DatetimeIndex(daily.index)
+        return cls(daily)
+
+    def rolling(self,windows=(7,30),start=None,end=None):
+        # 창 안의 모든 기록의 평균 점수 (기록 수로 가중)
+        out = {}
+        for w in windows:
+            if w not in self._rolling:
+                n = self.count.rolling(w,min_periods=1).sum()
+                self._rolling[w] = self.score_sum.rolling(w,min_periods=1).sum()/n.where(n>0)
+            out[f"{w}일 평균"] = self._rolling[w]
+        return pd.DataFrame(out,index=self.daily.index).loc[_span(start,end)]
+
+    def monthly(self,start=None,end=None,normalize=False):
+        months = self.daily.loc[_span(start,end)].resample("MS").sum()
+        months.index = months.index.strftime("%Y-%m")
+        if normalize:
+            months = months.div(months.sum(axis=1).where(lambda s:s>0),axis=0).fillna(0)
+        return months
+
+    def streaks(self,start=None,end=None):
+        count = self.count.loc[_span(start,end)]
+        score = self.score.loc[_span(start,end)]
+        if end is not None and len(count) and count.index[-1]<pd.Timestamp(end):
+            # 마지막 기록 이후 end 까지 빈 날도 '현재' 연속 일수에 반영
+            days = pd.date_range(count.index[0],pd.Timestamp(end),freq="D")
+            count,score = count.reindex(days,fill_value=0),score.reindex(days)
+        longest,current = _runs(count>0)
+        pos_longest,pos_current = _runs(score>=POSITIVE_SCORE)
+        return {"record_longest":longest,"record_current":current,
+                "positive_longest":pos_longest,"positive_current":pos_current}
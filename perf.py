@@ -0,0 +1,114 @@
+# perf.py
+# ⏱️ 핫패스 계측 (세 앱 공통)
+# - @timed("이름") 데코레이터 / with span("이름"): 실행 시간을 잰다
+# - begin_rerun(app) ~ end_rerun(): Streamlit 스크립트 한 번 실행(rerun) 동안의 구간을 모은다
+#   (rerun 은 스레드마다 따로 돌기 때문에 thread-local 에 모은다)
+# - 프로세스 전체 최근 샘플로 p50/p95 통계
+# - PERF_LOG 환경 변수에 경로를 주면 rerun 마다 JSONL 한 줄씩 기록
+# - ?debug=1 또는 PERF_PANEL=1 이면 사이드바에 성능 패널
+
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+PERF_LOG = os.environ.get("PERF_LOG")
+SAMPLES_PER_NAME = 1000
+
+_local = threading.local()
+_samples = defaultdict(lambda: deque(maxlen=SAMPLES_PER_NAME))
+_lock = threading.Lock()
+
+def _record(name, ms):
+    rerun = getattr(_local, "rerun", None)
+    if rerun is not None:
+        rerun["spans"].setdefault(name, []).append(ms)
+    with _lock:
+        _samples[name].append(ms)
+
+@contextmanager
+def span(name):
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, (time.perf_counter() - t) * 1000)
+
+def timed(name=None):
+    def deco(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _record(label, (time.perf_counter() - t) * 1000)
+        return wrapper
+    return deco
+
+# --- rerun 단위 집계 ---
+def begin_rerun(app):
+    _local.rerun = {"app": app, "ts": time.time(), "start": time.perf_counter(), "spans": {}}
+
+def end_rerun():
+    rerun = getattr(_local, "rerun", None)
+    if rerun is None:
+        return None
+    _local.rerun = None
+    total = (time.perf_counter() - rerun["start"]) * 1000
+    summary = {
+        "app": rerun["app"],
+        "ts": rerun["ts"],
+        "total_ms": total,
+        "spans": {name: {"count": len(v), "total_ms": sum(v), "samples_ms": v} for name, v in rerun["spans"].items()},
+    }
+    _record(f"{rerun['app']}.rerun", total)
+    if PERF_LOG:
+        export_jsonl(PERF_LOG, summary)
+    return summary
+
+def export_jsonl(path, record):
+    line = json.dumps(record, ensure_ascii=False)
+    with _lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+# --- 통계 ---
+def percentile(values, q):
+    # 최근접 순위 방식: 정렬했을 때 ceil(q/100 * n) 번째 값
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = max(math.ceil(q / 100 * len(ordered)) - 1, 0)
+    return ordered[min(k, len(ordered) - 1)]
+
+def stats():
+    with _lock:
+        snapshot = {name: list(v) for name, v in _samples.items()}
+    return {
+        name: {"count": len(v), "p50_ms": percentile(v, 50), "p95_ms": percentile(v, 95), "max_ms": max(v)}
+        for name, v in sorted(snapshot.items()) if v
+    }
+
+# --- 사이드바 패널 ---
+def panel_enabled():
+    if os.environ.get("PERF_PANEL") == "1":
+        return True
+    import streamlit as st
+    return st.query_params.get("debug") == "1"
+
+def render_panel(summary):
+    import streamlit as st
+    with st.sidebar.expander("⏱️ 성능 (debug)", expanded=False):
+        if summary:
+            st.write(f"이번 실행: **{summary['total_ms']:.1f} ms**")
+            st.table([{"구간": name, "횟수": s["count"], "ms": round(s["total_ms"], 2)}
+                      for name, s in sorted(summary["spans"].items(), key=lambda kv: -kv[1]["total_ms"])])
+        st.write("최근 샘플 (프로세스 전체)")
+        st.table([{"구간": name, "n": s["count"], "p50": round(s["p50_ms"], 2), "p95": round(s["p95_ms"], 2),
+                   "max": round(s["max_ms"], 2)} for name, s in stats().items()])
@@ -0,0 +1,53 @@
+# zodiac_batch.py
+# 📋 명단 일괄 운세
+# - 이름,생일(YYYY-MM-DD) 열이 있는 명단 CSV 를 한 줄씩 읽어 별자리/운세/행운의 색상·아이템을 CSV 로 쓴다
+# - 결과는 (이름, 생일, 날짜) 해시로 정해지므로 몇 번을 돌려도 같다
+# - 한 줄씩 읽고 바로 쓰므로 메모리는 명단 크기와 상관없이 일정하다
+# 사용법: python zodiac_batch.py roster.csv fortunes.csv --date 2025-03-10
+
+import argparse
+import csv
+import datetime
+import sys
+
+from zodiac_core import fortune_for
+
+OUTPUT_COLUMNS = ["name", "birth", "date", "zodiac", "fortune", "color", "item"]
+
+def generate(rows, day, out):
+    # rows: {"name", "birth"} dict 들, out: 텍스트 파일. (쓴 줄 수, 건너뛴 줄 수)
+    writer = csv.writer(out)
+    writer.writerow(OUTPUT_COLUMNS)
+    written = skipped = 0
+    for row in rows:
+        name = (row.get("name") or "").strip()
+        try:
+            birth = datetime.date.fromisoformat((row.get("birth") or "").strip())
+        except ValueError:
+            skipped += 1
+            continue
+        if not name:
+            skipped += 1
+            continue
+        f = fortune_for(name, birth, day)
+        writer.writerow([name, birth.isoformat(), day.isoformat(), f["zodiac"], f["fortune"], f["color"], f["item"]])
+        written += 1
+    return written, skipped
+
+def main():
+    parser = argparse.ArgumentParser(description="명단 CSV 의 모든 사람의 오늘의 운세를 CSV 로 만든다")
+    parser.add_argument("roster", help="name,birth 열이 있는 명단 CSV")
+    parser.add_argument("output", help="결과 CSV ('-' 이면 표준 출력)")
+    parser.add_argument("--date", default=datetime.date.today().isoformat(), help="운세 날짜 (YYYY-MM-DD)")
+    args = parser.parse_args()
+    day = datetime.date.fromisoformat(args.date)
+    with open(args.roster, encoding="utf-8-sig", newline="") as src:
+        if args.output == "-":
+            written, skipped = generate(csv.DictReader(src), day, sys.stdout)
+        else:
+            with open(args.output, "w", encoding="utf-8-sig", newline="") as out:
+                written, skipped = generate(csv.DictReader(src), day, out)
+    print(f"완료 {written}명, 건너뜀 {skipped}줄", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
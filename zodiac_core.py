@@ -0,0 +1,145 @@
+# zodiac_core.py
+# ✨ 별자리 계산
+# - 윤년 기준 366일 표(날짜 -> 별자리 번호)를 한 번만 만들어 두고 표에서 바로 찾는다
+# - 생일 배열(NumPy/pandas)을 한 번에 별자리로 바꾸는 벡터 API
+# - 운세/행운의 색상·아이템 목록과 (이름, 생일, 날짜) 해시로 정해지는 운세
+# - 서버 전체가 공유하는 오늘의 운세 캐시 (자정에 만료, 개수 제한 LRU)
+
+import datetime
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from perf import timed
+
+# --- 별자리 경계 (시작일, 끝일) ---
+ZODIAC_DATES = [
+    ("물병자리", (1, 20), (2, 18)),
+    ("물고기자리", (2, 19), (3, 20)),
+    ("양자리", (3, 21), (4, 19)),
+    ("황소자리", (4, 20), (5, 20)),
+    ("쌍둥이자리", (5, 21), (6, 21)),
+    ("게자리", (6, 22), (7, 22)),
+    ("사자자리", (7, 23), (8, 22)),
+    ("처녀자리", (8, 23), (9, 22)),
+    ("천칭자리", (9, 23), (10, 23)),
+    ("전갈자리", (10, 24), (11, 22)),
+    ("사수자리", (11, 23), (12, 21)),
+    ("염소자리", (12, 22), (1, 19)),
+]
+ZODIAC_SIGNS = np.array([z for z, _, _ in ZODIAC_DATES], dtype=object)
+
+# 윤년(2월 29일 포함) 기준 각 달 1일의 0-기준 순번
+MONTH_DAYS = np.array([31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+MONTH_OFFSETS = np.concatenate(([0], np.cumsum(MONTH_DAYS)[:-1]))
+
+def _build_table():
+    table = np.empty(366, dtype=np.uint8)
+    for code, (_, start, end) in enumerate(ZODIAC_DATES):
+        first = MONTH_OFFSETS[start[0] - 1] + start[1] - 1
+        last = MONTH_OFFSETS[end[0] - 1] + end[1] - 1
+        if first <= last:
+            table[first:last + 1] = code
+        else:  # 연말~연초에 걸친 염소자리
+            table[first:] = code
+            table[:last + 1] = code
+    return table
+
+ZODIAC_TABLE = _build_table()
+
+# --- 한 명 ---
+def get_zodiac(month, day):
+    if not (1 <= month <= 12 and 1 <= day <= MONTH_DAYS[month - 1]):
+        raise ValueError(f"올바르지 않은 날짜입니다: {month}월 {day}일")
+    return ZODIAC_SIGNS[ZODIAC_TABLE[MONTH_OFFSETS[month - 1] + day - 1]]
+
+# --- 여러 명 (배열) ---
+def zodiac_codes(months, days):
+    # 월/일 배열 -> 별자리 번호(ZODIAC_SIGNS 의 위치) 배열
+    months = np.asarray(months, dtype=np.int64)
+    days = np.asarray(days, dtype=np.int64)
+    return ZODIAC_TABLE[MONTH_OFFSETS[months - 1] + days - 1]
+
+def zodiac_of_dates(dates):
+    # datetime64 배열 / pandas Series·DatetimeIndex / date 목록 -> 별자리 이름 배열 (NaT/None 은 None)
+    d = np.asarray(dates, dtype="datetime64[D]")
+    missing = np.isnat(d)
+    d = np.where(missing, np.datetime64("2000-01-01"), d)
+    month_start = d.astype("datetime64[M]")
+    months = month_start.astype(np.int64) % 12 + 1
+    days = (d - month_start.astype("datetime64[D]")).astype(np.int64) + 1
+    signs = ZODIAC_SIGNS[zodiac_codes(months, days)]
+    signs[missing] = None
+    return signs
+
+# --- 별자리별 운세 메시지 ---
+zodiac_fortunes = {
+    "물병자리": ["새로운 아이디어가 떠오르는 날입니다.", "주변의 도움으로 일이 술술 풀립니다."],
+    "물고기자리": ["감성이 풍부해지는 하루입니다.", "누군가의 고마움을 느끼게 될 거예요."],
+    "양자리": ["도전이 행운을 불러옵니다.", "열정적인 태도가 좋은 결과를 줍니다."],
+    "황소자리": ["안정과 성실함이 빛나는 하루입니다.", "재정적으로 유리한 기회가 올 수 있어요."],
+    "쌍둥이자리": ["소통 능력이 돋보이는 날입니다.", "예상치 못한 만남이 기다리고 있습니다."],
+    "게자리": ["가족과의 시간이 큰 힘이 됩니다.", "따뜻한 말 한마디가 좋은 결과를 만듭니다."],
+    "사자자리": ["자신감을 보일수록 운이 따릅니다.", "리더십이 인정받는 하루입니다."],
+    "처녀자리": ["세심함이 좋은 결과를 만듭니다.", "작은 성취가 기쁨을 줍니다."],
+    "천칭자리": ["균형 잡힌 선택이 필요합니다.", "주변과 협력하면 행운이 찾아옵니다."],
+    "전갈자리": ["열정이 좋은 성과를 가져옵니다.", "깊은 대화가 관계를 더욱 돈독히 합니다."],
+    "사수자리": ["모험심이 행운을 불러옵니다.", "여행이나 이동에서 좋은 소식이 있습니다."],
+    "염소자리": ["끈기 있는 태도가 결실을 맺습니다.", "노력의 보상이 다가옵니다."],
+}
+
+# --- 행운의 아이템 / 색상 ---
+lucky_colors = ["파란색", "초록색", "노란색", "보라색", "빨간색", "하얀색", "검은색", "분홍색"]
+lucky_items = ["책", "꽃", "커피", "휴대폰", "헤드폰", "노트북", "운동화", "시계", "반지", "가방"]
+
+# --- 정해진 운세 ---
+def fortune_for(name, birth, day):
+    # (이름, 생일, 날짜)의 해시로 고르므로 같은 입력이면 언제나 같은 결과
+    zodiac = get_zodiac(birth.month, birth.day)
+    key = f"{name}|{birth.isoformat()}|{day.isoformat()}".encode("utf-8")
+    h = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+    fortunes = zodiac_fortunes[zodiac]
+    return {
+        "zodiac": zodiac,
+        "fortune": fortunes[h % len(fortunes)],
+        "color": lucky_colors[(h >> 16) % len(lucky_colors)],
+        "item": lucky_items[(h >> 32) % len(lucky_items)],
+    }
+
+# --- 오늘의 운세 캐시 ---
+class FortuneCache:
+    # (날짜, 별자리, 사용자) -> 운세. 날짜가 바뀌면(자정) 통째로 비우고,
+    # max_entries 를 넘으면 가장 오래 안 쓴 항목부터 버린다.
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._day = None
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    @timed("zodiac.fortune")
+    def get(self, name, birth, day=None):
+        day = day or datetime.date.today()
+        zodiac = get_zodiac(birth.month, birth.day)
+        key = (day, zodiac, name, birth)
+        with self._lock:
+            if day != self._day:
+                self._entries.clear()
+                self._day = day
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+        result = fortune_for(name, birth, day)
+        with self._lock:
+            self.misses += 1
+            if day == self._day:
+                self._entries[key] = result
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return result
+
+fortune_cache = FortuneCache()